@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
 import uuid
 import time
+import asyncio
 from string import Template
+from pydantic import BaseModel
 
 from app.core.auth import resolve_workspace_uid, has_role_access
 from app.core.auth import get_fs_client as _get_fs_client
 from app.utils.emailing import render_email, send_email_smtp
 from app.core.config import logger
-from app.utils.storage import read_json_key, write_json_key
+from app.utils.storage import read_json_key, write_json_key, aread_json_key, awrite_json_key
+from app.utils.booking_index import index_items, add_index_item, newest_first
 
 router = APIRouter(prefix="/api/booking", tags=["booking"])  # dashboard + form settings
 # Single booking layout (Split). Templates removed.
@@ -45,6 +48,40 @@ except Exception:
 
 # --------- Form settings (per-user) ---------
 
+class FormPatch(BaseModel):
+    background_color: Optional[str] = None
+    form_card_bg: Optional[str] = None
+    label_color: Optional[str] = None
+    button_bg: Optional[str] = None
+    button_text: Optional[str] = None
+    hide_payment_option: Optional[bool] = None
+    allow_in_studio: Optional[bool] = None
+
+
+# Defaults for a freshly created form (get_form)
+_DEFAULT_FORM: Dict[str, Any] = {
+    "background_color": "#0a0d0f",
+    # Optional customizations with sensible defaults
+    "form_card_bg": "rgba(255,255,255,.04)",
+    "label_color": "#cbd5e1",
+    "button_bg": "#7fe0d6",
+    "button_text": "#001014",
+    "hide_payment_option": False,
+    "allow_in_studio": False,
+}
+
+# Values used by update_form/public page when a field was never saved
+_FORM_FALLBACKS: Dict[str, Any] = {
+    "background_color": "#0b0b0c",
+    "form_card_bg": "rgba(255,255,255,.06)",
+    "label_color": "#fafafa",
+    "button_bg": "#8ab4f8",
+    "button_text": "#000000",
+    "hide_payment_option": False,
+    "allow_in_studio": False,
+}
+
+
 @router.get("/form")
 async def get_form(request: Request):
     eff_uid, req_uid = resolve_workspace_uid(request)
@@ -57,16 +94,8 @@ async def get_form(request: Request):
     form = read_json_key(_user_form_key(eff_uid)) or {}
     if not form.get("form_id"):
         form_id = _new_id()
-        form = {
+        form = _DEFAULT_FORM | {k: v for k, v in form.items() if k in _DEFAULT_FORM and v} | {
             "form_id": form_id,
-            "background_color": form.get("background_color") or "#0a0d0f",
-            # Optional customizations with sensible defaults
-            "form_card_bg": form.get("form_card_bg") or "rgba(255,255,255,.04)",
-            "label_color": form.get("label_color") or "#cbd5e1",
-            "button_bg": form.get("button_bg") or "#7fe0d6",
-            "button_text": form.get("button_text") or "#001014",
-            "hide_payment_option": bool(form.get("hide_payment_option") or False),
-            "allow_in_studio": bool(form.get("allow_in_studio") or False),
             "updated_at": int(time.time()),
         }
         write_json_key(_user_form_key(eff_uid), form)
@@ -75,7 +104,7 @@ async def get_form(request: Request):
 
 
 @router.post("/form")
-async def update_form(request: Request, payload: Dict[str, Any]):
+async def update_form(request: Request, payload: FormPatch):
     eff_uid, req_uid = resolve_workspace_uid(request)
     if not eff_uid or not req_uid:
         return {"error": "Unauthorized"}
@@ -89,25 +118,13 @@ async def update_form(request: Request, payload: Dict[str, Any]):
         write_json_key(_form_registry_key(form_id), {"user_uid": eff_uid})
         form["form_id"] = form_id
 
-    bg = payload.get("background_color") or form.get("background_color") or "#0b0b0c"
-    form_card_bg = payload.get("form_card_bg") or form.get("form_card_bg") or "rgba(255,255,255,.06)"
-    label_color = payload.get("label_color") or form.get("label_color") or "#fafafa"
-    button_bg = payload.get("button_bg") or form.get("button_bg") or "#8ab4f8"
-    button_text = payload.get("button_text") or form.get("button_text") or "#000000"
-    hide_payment_option = bool(payload.get("hide_payment_option") if payload.get("hide_payment_option") is not None else form.get("hide_payment_option") or False)
-    allow_in_studio = bool(payload.get("allow_in_studio") if payload.get("allow_in_studio") is not None else form.get("allow_in_studio") or False)
-    # template removed
-
-    form.update({
-        "background_color": str(bg),
-        "form_card_bg": str(form_card_bg),
-        "label_color": str(label_color),
-        "button_bg": str(button_bg),
-        "button_text": str(button_text),
-        "hide_payment_option": bool(hide_payment_option),
-        "allow_in_studio": bool(allow_in_studio),
-        "updated_at": int(time.time()),
-    })
+    # Only fields the client actually sent; types already validated by FormPatch.
+    # Blank strings count as not sent, so they keep the saved value.
+    form.update({k: v for k, v in payload.model_dump(exclude_none=True).items() if v != ""})
+    for k, default in _FORM_FALLBACKS.items():
+        if form.get(k) in (None, ""):
+            form[k] = default
+    form["updated_at"] = int(time.time())
     write_json_key(_user_form_key(eff_uid), form)
     return form
 
@@ -127,8 +144,8 @@ async def public_booking_form(form_id: str, request: Request):
     label_color = form.get("label_color") or "#fafafa"
     button_bg = form.get("button_bg") or "#8ab4f8"
     button_text = form.get("button_text") or "#000000"
-    hide_payment_option = bool(form.get("hide_payment_option") or False)
-    allow_in_studio = bool(form.get("allow_in_studio") or False)
+    hide_payment_option = form.get("hide_payment_option") or False
+    allow_in_studio = form.get("allow_in_studio") or False
     # templates removed; always render split layout
     # Default date prefill through query param ?date=YYYY-MM-DD
     try:
@@ -162,23 +179,9 @@ async def public_booking_form(form_id: str, request: Request):
     return HTMLResponse(html)
 
 
-def _render_public_form_html(
-    form_id: str,
-    bg: str,
-    default_date: str = "",
-    *,
-    form_card_bg: str = "rgba(255,255,255,.04)",
-    label_color: str = "#cbd5e1",
-    button_bg: str = "#7fe0d6",
-    button_text: str = "#001014",
-    hide_payment_option: bool = False,
-    allow_in_studio: bool = False,
-    full_form: bool = False,
-    no_cta: bool = False,
-) -> str:
-    # Use Template to avoid f-string brace issues with CSS/JS
-    css_tpl = Template(
-        """
+# Public form CSS: base rules + layout rules merged once at import so each
+# render does a single Template.substitute (see _render_public_form_html)
+_CSS_BASE = """
     :root{--pm-accent:#8ab4f8}
     *{box-sizing:border-box}
     body{margin:0;background:${bg};color:#fafafa;font-family:'Outfit', -apple-system, system-ui, Segoe UI, Roboto, Ubuntu, Cantarell, Noto Sans, Helvetica Neue, Arial}
@@ -193,20 +196,9 @@ def _render_public_form_html(
     .note{font-size:12px;opacity:.75;margin-top:8px}
     .ok{background:#10b981;color:#001}
     .err{background:#ef4444;color:#fff}
-        """.strip()
-    )
-    # Base CSS shared
-    base_css = css_tpl.substitute(
-        bg=bg,
-        form_card_bg=form_card_bg,
-        label_color=label_color,
-        button_bg=button_bg,
-        button_text=button_text,
-    )
+        """
 
-    if full_form:
-        layout_css = Template(
-            """
+_CSS_LAYOUT_FULL = """
             .container{max-width:720px;margin:0 auto;padding:20px}
             .form-card{border:1px solid rgba(255,255,255,.12);border-radius:20px;background:${form_card_bg};padding:22px;box-shadow:0 10px 40px rgba(0,0,0,.35)}
             .form-title{font-size:18px;font-weight:700;margin-bottom:16px}
@@ -219,10 +211,8 @@ def _render_public_form_html(
             .actions{margin-top:16px}
             .actions button{background:${button_bg};color:${button_text};font-weight:700;padding:10px 14px;border-radius:10px;border:0}
             """
-        ).substitute(form_card_bg=form_card_bg, label_color=label_color, button_bg=button_bg, button_text=button_text)
-    else:
-        layout_css = Template(
-            """
+
+_CSS_LAYOUT_SPLIT = """
             .container{max-width:980px;display:grid;grid-template-columns:1.1fr 1fr;gap:28px;align-items:start}
             @media(max-width:980px){.container{display:block}}
             .hero{background:linear-gradient(180deg, rgba(255,255,255,.04), rgba(255,255,255,.02));border:1px solid rgba(255,255,255,.12);border-radius:24px;padding:24px;box-shadow:0 10px 40px rgba(0,0,0,.35)}
@@ -241,9 +231,34 @@ def _render_public_form_html(
             .actions{margin-top:16px}
             .actions button{background:${button_bg};color:${button_text};font-weight:700;padding:10px 14px;border-radius:10px;border:0}
             """
-        ).substitute(form_card_bg=form_card_bg, label_color=label_color, button_bg=button_bg, button_text=button_text)
 
-    css = base_css + "\n" + layout_css
+_CSS_TPL_FULL = Template(_CSS_BASE.strip() + "\n" + _CSS_LAYOUT_FULL)
+_CSS_TPL_SPLIT = Template(_CSS_BASE.strip() + "\n" + _CSS_LAYOUT_SPLIT)
+
+
+def _render_public_form_html(
+    form_id: str,
+    bg: str,
+    default_date: str = "",
+    *,
+    form_card_bg: str = "rgba(255,255,255,.04)",
+    label_color: str = "#cbd5e1",
+    button_bg: str = "#7fe0d6",
+    button_text: str = "#001014",
+    hide_payment_option: bool = False,
+    allow_in_studio: bool = False,
+    full_form: bool = False,
+    no_cta: bool = False,
+) -> str:
+    # Use Template to avoid f-string brace issues with CSS/JS
+    css_tpl = _CSS_TPL_FULL if full_form else _CSS_TPL_SPLIT
+    css = css_tpl.substitute(
+        bg=bg,
+        form_card_bg=form_card_bg,
+        label_color=label_color,
+        button_bg=button_bg,
+        button_text=button_text,
+    )
 
     # Prepare conditional payment option HTML
     payment_html = "" if hide_payment_option else (
@@ -529,6 +544,16 @@ async def preview_booking(request: Request):
 
 # --------- Public submit (no auth) ---------
 
+def _fs_set_booking(uid: str, booking_id: str, record: Dict[str, Any]):
+    # Firestore persistence (best-effort)
+    try:
+        db = _get_fs_client()
+        if db is not None:
+            db.collection('users').document(uid).collection('bookings').document(booking_id).set(record, merge=True)
+    except Exception as ex:
+        logger.warning(f"booking submit: firestore write failed for {uid}/{booking_id}: {ex}")
+
+
 @router.post("/submit")
 async def submit_booking(
     form_id: str = Form(...),
@@ -544,7 +569,7 @@ async def submit_booking(
 ):
     try:
         # resolve form -> user
-        reg = read_json_key(_form_registry_key(form_id)) or {}
+        reg = await aread_json_key(_form_registry_key(form_id)) or {}
         uid = reg.get("user_uid")
         if not uid:
             return {"error": "invalid_form"}
@@ -571,18 +596,12 @@ async def submit_booking(
             record["latitude"] = latitude
         if longitude:
             record["longitude"] = longitude
-        write_json_key(_user_booking_record_key(uid, booking_id), record)
+        # Record file and Firestore doc are independent of the index; start them now
+        rec_task = asyncio.create_task(awrite_json_key(_user_booking_record_key(uid, booking_id), record))
+        fs_task = asyncio.create_task(asyncio.to_thread(_fs_set_booking, uid, booking_id, record))
 
-        # Firestore persistence (best-effort)
-        try:
-            db = _get_fs_client()
-            if db is not None:
-                db.collection('users').document(uid).collection('bookings').document(booking_id).set(record, merge=True)
-        except Exception as ex:
-            logger.warning(f"booking submit: firestore write failed for {uid}/{booking_id}: {ex}")
-
-        idx = read_json_key(_user_bookings_index_key(uid)) or {"items": []}
-        items = idx.get("items") or []
+        idx = await aread_json_key(_user_bookings_index_key(uid)) or {}
+        items = index_items(idx)
         # store a lightweight copy for listing
         lite_keys = ["id","client_name","email","phone","date","payment_option","status","created_at","updated_at"]
         try:
@@ -591,9 +610,9 @@ async def submit_booking(
         except Exception:
             pass
         lite = {k: record[k] for k in lite_keys if k in record}
-        items.insert(0, lite)
-        idx["items"] = items[:1000]
-        write_json_key(_user_bookings_index_key(uid), idx)
+        add_index_item(items, booking_id, lite)
+        idx["items"] = items
+        await asyncio.gather(rec_task, fs_task, awrite_json_key(_user_bookings_index_key(uid), idx))
         return {"ok": True, "id": booking_id}
     except Exception as ex:
         logger.exception(f"booking submit failed: {ex}")
@@ -645,8 +664,8 @@ async def list_bookings(request: Request, status: Optional[str] = None):
         logger.warning(f"booking list: firestore read failed for {eff_uid}: {ex}")
 
     # Fallback to JSON index
-    idx = read_json_key(_user_bookings_index_key(eff_uid)) or {"items": []}
-    items = idx.get("items") or []
+    idx = read_json_key(_user_bookings_index_key(eff_uid)) or {}
+    items = newest_first(index_items(idx))
     if status and status in ("new","pending","confirmed","cancelled"):
         items = [it for it in items if it.get("status") == status]
     return {"items": items}
@@ -712,13 +731,12 @@ async def update_status(request: Request, booking_id: str, payload: Dict[str, An
         logger.warning(f"booking status: firestore update failed for {eff_uid}/{booking_id}: {ex}")
 
     # update index
-    idx = read_json_key(_user_bookings_index_key(eff_uid)) or {"items": []}
-    items: List[Dict[str, Any]] = idx.get("items") or []
-    for it in items:
-        if it.get("id") == booking_id:
-            it["status"] = new_status
-            it["updated_at"] = now
-            break
+    idx = read_json_key(_user_bookings_index_key(eff_uid)) or {}
+    items = index_items(idx)
+    it = items.get(booking_id)
+    if it is not None:
+        it["status"] = new_status
+        it["updated_at"] = now
     idx["items"] = items
     write_json_key(_user_bookings_index_key(eff_uid), idx)
 
@@ -1,11 +1,12 @@
 import os
 from typing import Optional, Tuple
 from fastapi import Request
-from app.core.config import logger
+from app.core.config import logger, COLLAB_JWT_SECRET
 from app.utils.storage import read_json_key
+from app.utils.ttl_cache import TTLCache
 
 # Collaboration helpers
-ALLOWED_ROLES = {"admin", "retoucher", "gallery_manager"}
+ALLOWED_ROLES = frozenset({"admin", "retoucher", "gallery_manager"})
 
 
 def _owner_ptr_key(member_uid: str) -> str:
@@ -33,21 +34,46 @@ def resolve_workspace_uid(request: Request) -> tuple[Optional[str], Optional[str
     return (owner or req_uid), req_uid
 
 
+# owner_uid -> (role_by_uid, role_by_email); role checks run on most workspace requests
+_TEAM_CACHE = TTLCache(maxsize=4096, ttl=30)
+
+
+def _index_team(team: dict) -> tuple[dict, dict]:
+    by_uid: dict = {}
+    by_email: dict = {}
+    for m in team.get("members", []) or []:
+        role = (m.get("role") or "").lower()
+        if m.get("uid"):
+            by_uid.setdefault(m.get("uid"), role)
+        if m.get("email"):
+            by_email.setdefault((m.get("email") or "").lower(), role)
+    return by_uid, by_email
+
+
+def _team_roles(owner_uid: str) -> tuple[dict, dict]:
+    roles = _TEAM_CACHE.get(owner_uid)
+    if roles is not None:
+        return roles
+    team = read_json_key(f"users/{owner_uid}/collab/team.json")
+    roles = _index_team(team or {})
+    # A None read may be a transient storage error; don't pin an empty team for the TTL
+    if team is not None:
+        _TEAM_CACHE.put(owner_uid, roles)
+    return roles
+
+
 def has_role_access(requester_uid: str, owner_uid: str, area: str) -> bool:
     """area: 'retouch' | 'convert' | 'gallery' | 'all'"""
     # Owner always has full access
     if requester_uid == owner_uid:
         return True
     # Load team of owner and check member role
-    team = read_json_key(f"users/{owner_uid}/collab/team.json") or {}
-    members = team.get("members", []) or []
-    role = None
-    # Prefer uid match, fallback email
-    req_email = get_user_email_from_uid(requester_uid) or ""
-    for m in members:
-        if m.get("uid") == requester_uid or (req_email and (m.get("email") or "").lower() == req_email):
-            role = (m.get("role") or "").lower()
-            break
+    by_uid, by_email = _team_roles(owner_uid)
+    # Prefer uid match, fallback email (only resolved when the uid is not listed)
+    role = by_uid.get(requester_uid)
+    if role is None:
+        req_email = get_user_email_from_uid(requester_uid) or ""
+        role = by_email.get(req_email) if req_email else None
     if not role:
         return False
     if role == "admin":
@@ -58,6 +84,12 @@ def has_role_access(requester_uid: str, owner_uid: str, area: str) -> bool:
         return True
     return False
 
+# Collaborator tokens are HS256 JWTs (PyJWT is optional); resolved once at import
+try:
+    import jwt  # type: ignore
+except Exception:
+    jwt = None  # type: ignore
+
 firebase_enabled = False
 try:
     import firebase_admin
@@ -98,15 +130,24 @@ except Exception as ex:
 
 
 # Helper to get Firestore client
+_fs_client = None
+
+
 def get_fs_client():
+    # One long-lived client (and gRPC channel) per process; failures are not cached
+    global _fs_client
+    if _fs_client is not None:
+        return _fs_client
     try:
         if not firebase_enabled:
             return None
         if 'fb_fs' in globals() and fb_fs:
-            return fb_fs.client()  # type: ignore
-        # Lazy import fallback
-        from firebase_admin import firestore as _fb_fs  # type: ignore
-        return _fb_fs.client()
+            _fs_client = fb_fs.client()  # type: ignore
+        else:
+            # Lazy import fallback
+            from firebase_admin import firestore as _fb_fs  # type: ignore
+            _fs_client = _fb_fs.client()
+        return _fs_client
     except Exception:
         return None
 
@@ -130,16 +171,14 @@ def get_uid_from_request(request: Request) -> Optional[str]:
     if not token:
         return None
     # Try collaborator JWT first (HS256)
-    try:
-        from app.core.config import COLLAB_JWT_SECRET
-        import jwt  # type: ignore
-        if COLLAB_JWT_SECRET:
+    if jwt is not None and COLLAB_JWT_SECRET:
+        try:
             decoded = jwt.decode(token, COLLAB_JWT_SECRET, algorithms=["HS256"])  # raises on invalid
             if decoded.get("kind") == "collab" and isinstance(decoded.get("sub"), str):
                 return decoded.get("sub")
-    except Exception:
-        # Not a valid collaborator token; fall through to Firebase
-        pass
+        except Exception:
+            # Not a valid collaborator token; fall through to Firebase
+            pass
     # Firebase token
     if not firebase_enabled or not fb_auth:
         return None
@@ -118,6 +118,9 @@ STATIC_DIR = os.path.join(os.path.dirname(__file__), "..", "static")
 STATIC_DIR = os.path.abspath(STATIC_DIR)
 
 # S3/R2 client
+# One process-wide resource; size its keep-alive pool for the threadpool that calls into it
+# (botocore defaults to 10, which forces fresh TLS handshakes under concurrent storage I/O).
+R2_MAX_POOL_CONNECTIONS = int(os.getenv("R2_MAX_POOL_CONNECTIONS", "32"))
 s3 = None
 if R2_ACCOUNT_ID and R2_ACCESS_KEY_ID and R2_SECRET_ACCESS_KEY:
     s3 = boto3.resource(
@@ -125,6 +128,10 @@ if R2_ACCOUNT_ID and R2_ACCESS_KEY_ID and R2_SECRET_ACCESS_KEY:
         endpoint_url=f"https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
         aws_access_key_id=R2_ACCESS_KEY_ID,
         aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-        config=BotoConfig(signature_version="s3v4"),
+        config=BotoConfig(
+            signature_version="s3v4",
+            max_pool_connections=R2_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
         region_name="auto",
     )
\ No newline at end of file
@@ -1,10 +1,13 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+import asyncio
 import os
 import warnings
 
 from app.core.config import logger
+from app.utils.emailing import flush_mail_queue
 
 # Silence a noisy Kornia FutureWarning (does not affect our watermark pipeline)
 warnings.filterwarnings(
@@ -19,7 +22,14 @@ from app.routers import images, photos, auth, convert, vaults, voice, collab, ga
 
 # Pricing checkout (server-side) removed in favor of client-side overlay
 
-app = FastAPI(title="Photo Watermarker")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Let the background SMTP sender drain queued notifications before the worker exits
+    await asyncio.to_thread(flush_mail_queue, 10.0)
+
+
+app = FastAPI(title="Photo Watermarker", lifespan=lifespan)
 
 # ---- CORS setup ----
 # Prefer ALLOWED_ORIGINS, but also support legacy env names used in .env
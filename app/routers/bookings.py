@@ -1,19 +1,41 @@
-from fastapi import APIRouter, Request, Form
-from fastapi.responses import HTMLResponse
-from typing import Optional, Dict, Any, List
-import uuid
+from fastapi import APIRouter, Request, Form, BackgroundTasks, Query
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Dict, Any, List, Annotated
+import asyncio
+import secrets
 import time
 import os
+import re
+from functools import lru_cache
 from string import Template
 
 from app.core.auth import resolve_workspace_uid, has_role_access
 from app.core.auth import get_fs_client as _get_fs_client
 from app.core.auth import get_user_email_from_uid
-from app.utils.emailing import render_email, send_email_smtp
+from app.utils.emailing import render_email, queue_email_smtp
 from app.core.config import logger
-from app.utils.storage import read_json_key, write_json_key
+from app.utils.storage import read_json_key, write_json_key, aread_json_key, awrite_json_key
+from app.utils.ttl_cache import TTLCache
+from app.utils.booking_index import INDEX_LIMIT, index_items, add_index_item, listing_key, newest_first
 
-router = APIRouter(prefix="/api/booking", tags=["booking"])  # dashboard + form settings
+router = APIRouter(prefix="/api/booking", tags=["booking"], default_response_class=ORJSONResponse)  # dashboard + form settings
+
+_HTML_ESCAPE_TABLE = str.maketrans({"<": "&lt;", ">": "&gt;", "&": "&amp;", '"': "&quot;", "'": "&#39;"})
+_HTML_UNSAFE_RE = re.compile(r"[<>&\"']")
+
+
+def _esc(s: Any) -> str:
+    # Single-pass HTML escape for values interpolated into notification emails;
+    # most values (phone, date, payment) need none, so return them untouched
+    s = "" if s is None else str(s)
+    return s.translate(_HTML_ESCAPE_TABLE) if _HTML_UNSAFE_RE.search(s) else s
+
+
+_STATUSES = frozenset({"new", "pending", "confirmed", "cancelled"})
+_PAYMENTS = frozenset({"online", "offline"})
+# Fields copied into the lightweight index entry used for listing
+_LITE_KEYS = ("id", "client_name", "email", "phone", "date", "payment_option", "status", "created_at", "updated_at", "location")
 # Single booking layout (Split). Templates removed.
 
 
@@ -36,164 +58,239 @@ def _user_booking_record_key(uid: str, booking_id: str) -> str:
 
 
 def _new_id() -> str:
-    return uuid.uuid4().hex[:12]
+    return secrets.token_hex(6)
 
-# Firestore client types (optional)
-try:
-    from firebase_admin import firestore as fb_fs  # type: ignore
-except Exception:
-    fb_fs = None  # type: ignore
+
+# ---- Tiny in-memory TTL cache for form + registry JSON (hit on every embed view) ----
+_JSON_CACHE = TTLCache(maxsize=4096, ttl=60)
+
+
+def _cached_read_json(key: str) -> Optional[dict]:
+    data = _JSON_CACHE.get(key)
+    if data is None:
+        data = read_json_key(key)
+        if data is None:
+            return None
+        _JSON_CACHE.put(key, data)
+    # Callers mutate the form in place; hand out a copy
+    return dict(data)
+
+
+def _cached_write_json(key: str, payload: dict):
+    write_json_key(key, payload)
+    _JSON_CACHE.pop(key)
+
+
+# form_id -> owner uid; the registry entry never changes once written
+_FORM_OWNER_CACHE = TTLCache(maxsize=4096, ttl=3600)
+
+
+def _form_owner(form_id: str) -> Optional[str]:
+    uid = _FORM_OWNER_CACHE.get(form_id)
+    if uid is None:
+        uid = (read_json_key(_form_registry_key(form_id)) or {}).get("user_uid")
+        if uid:
+            _FORM_OWNER_CACHE.put(form_id, uid)
+    return uid
+
+
+def _register_form(form_id: str, uid: str):
+    write_json_key(_form_registry_key(form_id), {"user_uid": uid})
+    _FORM_OWNER_CACHE.put(form_id, uid)
+
+
+# uid -> (email, name) for notification emails; avoids a Firestore get per booking event
+_OWNER_CACHE = TTLCache(maxsize=4096, ttl=300)
+
+
+def _owner_contact(uid: str) -> tuple[str, str]:
+    hit = _OWNER_CACHE.get(uid)
+    if hit is not None:
+        return hit
+    owner_email = ""
+    account_name = ""
+    try:
+        owner_email = (get_user_email_from_uid(uid) or '').strip()
+    except Exception:
+        pass
+    try:
+        db = _get_fs_client()
+        if db is not None:
+            snap = db.collection('users').document(uid).get()
+            if getattr(snap, 'exists', False):
+                data = snap.to_dict() or {}
+                account_name = str(data.get('name') or '').strip()
+                owner_email = owner_email or str(data.get('email') or '').strip()
+    except Exception:
+        pass
+    # Only cache successful lookups so a transient Firestore error is retried next time
+    if owner_email:
+        _OWNER_CACHE.put(uid, (owner_email, account_name))
+    return owner_email, account_name
 
 
 # --------- Form settings (per-user) ---------
 
+def _clamp(v: int, lo: int, hi: int) -> int:
+    return lo if v < lo else hi if v > hi else v
+
+
+def _to_int(v: Any, default: int, lo: int, hi: int) -> int:
+    try:
+        return _clamp(int(v), lo, hi)
+    except (TypeError, ValueError):
+        return default
+
+
+def _clamped(default: int, lo: int, hi: int):
+    return lambda v: _to_int(v, default, lo, hi)
+
+
+def _align(v: Any) -> str:
+    v = str(v).lower()
+    return v if v in ("left", "center", "right") else "center"
+
+
+# Settings for a freshly created form (get_form)
+_DEFAULT_FORM: Dict[str, Any] = {
+    "background_color": "#0a0d0f",
+    # Optional customizations with sensible defaults
+    "form_card_bg": "rgba(255,255,255,.04)",
+    "label_color": "#cbd5e1",
+    "button_bg": "#7fe0d6",
+    "button_text": "#001014",
+    "hide_payment_option": False,
+    "allow_in_studio": False,
+    "title": "Book a Photoshoot",
+    "subtitle": "Fill this form here",
+    "title_align": "center",
+    "subtitle_align": "center",
+    "title_size": 28,
+    "subtitle_size": 14,
+    "title_font": "Inter",
+    "subtitle_font": "Inter",
+    "input_radius": 10,
+    "submit_label": "Request Booking",
+    "title_font_data": "",
+    "subtitle_font_data": "",
+    "label_font": "Inter",
+    "label_size": 14,
+    "label_font_data": "",
+    "studio_address": "",
+    "studio_lat": "",
+    "studio_lng": "",
+    "maps_api_key": "",
+}
+
+# (key, default, cast) for every appearance/settings field accepted by update_form
+_FORM_FIELDS = (
+    ("background_color", "#0b0b0c", str),
+    ("form_card_bg", "rgba(255,255,255,.06)", str),
+    ("label_color", "#fafafa", str),
+    ("button_bg", "#8ab4f8", str),
+    ("button_text", "#000000", str),
+    ("hide_payment_option", False, bool),
+    ("allow_in_studio", False, bool),
+    ("title", "Book a Photoshoot", str),
+    ("subtitle", "Fill this form here", str),
+    ("title_align", "center", _align),
+    ("subtitle_align", "center", _align),
+    ("title_size", 28, _clamped(28, 8, 96)),
+    ("subtitle_size", 14, _clamped(14, 8, 48)),
+    ("title_font", "Inter", str),
+    ("subtitle_font", "Inter", str),
+    ("label_font", "Inter", str),
+    ("label_size", 14, _clamped(14, 8, 48)),
+    ("input_radius", 10, _clamped(10, 0, 32)),
+    ("submit_label", "Request Booking", str),
+    ("title_font_data", "", str),
+    ("subtitle_font_data", "", str),
+    ("label_font_data", "", str),
+    ("studio_address", "", str),
+    ("studio_lat", "", str),
+    ("studio_lng", "", str),
+    ("maps_api_key", "", str),
+)
+
+
 @router.get("/form")
 async def get_form(request: Request):
-    eff_uid, req_uid = resolve_workspace_uid(request)
+    eff_uid, req_uid = await asyncio.to_thread(resolve_workspace_uid, request)
     if not eff_uid or not req_uid:
         return {"error": "Unauthorized"}
-    if not has_role_access(req_uid, eff_uid, 'gallery'):
+    if not await asyncio.to_thread(has_role_access, req_uid, eff_uid, 'gallery'):
         return {"error": "Forbidden"}
 
     # Load or create default form
-    form = read_json_key(_user_form_key(eff_uid)) or {}
+    form = await asyncio.to_thread(_cached_read_json, _user_form_key(eff_uid)) or {}
     if not form.get("form_id"):
         form_id = _new_id()
-        form = {
+        form = _DEFAULT_FORM | {k: v for k, v in form.items() if k in _DEFAULT_FORM and v} | {
             "form_id": form_id,
-            "background_color": form.get("background_color") or "#0a0d0f",
-            # Optional customizations with sensible defaults
-            "form_card_bg": form.get("form_card_bg") or "rgba(255,255,255,.04)",
-            "label_color": form.get("label_color") or "#cbd5e1",
-            "button_bg": form.get("button_bg") or "#7fe0d6",
-            "button_text": form.get("button_text") or "#001014",
-            "hide_payment_option": bool(form.get("hide_payment_option") or False),
-            "allow_in_studio": bool(form.get("allow_in_studio") or False),
-            "title": form.get("title") or "Book a Photoshoot",
-            "subtitle": form.get("subtitle") or "Fill this form here",
-            "title_align": form.get("title_align") or "center",
-            "subtitle_align": form.get("subtitle_align") or "center",
-            "title_size": int(form.get("title_size") or 28),
-            "subtitle_size": int(form.get("subtitle_size") or 14),
-            "title_font": form.get("title_font") or "Inter",
-            "subtitle_font": form.get("subtitle_font") or "Inter",
-            "input_radius": int(form.get("input_radius") or 10),
-            "submit_label": form.get("submit_label") or "Request Booking",
-            "title_font_data": form.get("title_font_data") or "",
-            "subtitle_font_data": form.get("subtitle_font_data") or "",
-            "label_font": form.get("label_font") or "Inter",
-            "label_size": int(form.get("label_size") or 14),
-            "label_font_data": form.get("label_font_data") or "",
-            "studio_address": form.get("studio_address") or "",
-            "studio_lat": form.get("studio_lat") or "",
-            "studio_lng": form.get("studio_lng") or "",
-            "maps_api_key": form.get("maps_api_key") or "",
             "updated_at": int(time.time()),
         }
-        write_json_key(_user_form_key(eff_uid), form)
-        write_json_key(_form_registry_key(form_id), {"user_uid": eff_uid})
+        await asyncio.gather(
+            asyncio.to_thread(_cached_write_json, _user_form_key(eff_uid), form),
+            asyncio.to_thread(_register_form, form_id, eff_uid),
+        )
     return form
 
 
 @router.post("/form")
 async def update_form(request: Request, payload: Dict[str, Any]):
-    eff_uid, req_uid = resolve_workspace_uid(request)
+    eff_uid, req_uid = await asyncio.to_thread(resolve_workspace_uid, request)
     if not eff_uid or not req_uid:
         return {"error": "Unauthorized"}
-    if not has_role_access(req_uid, eff_uid, 'gallery'):
+    if not await asyncio.to_thread(has_role_access, req_uid, eff_uid, 'gallery'):
         return {"error": "Forbidden"}
 
-    form = read_json_key(_user_form_key(eff_uid)) or {}
+    form = await asyncio.to_thread(_cached_read_json, _user_form_key(eff_uid)) or {}
+    before = dict(form)
     if not form.get("form_id"):
         # create if missing
         form_id = _new_id()
-        write_json_key(_form_registry_key(form_id), {"user_uid": eff_uid})
+        await asyncio.to_thread(_register_form, form_id, eff_uid)
         form["form_id"] = form_id
 
-    bg = payload.get("background_color") or form.get("background_color") or "#0b0b0c"
-    form_card_bg = payload.get("form_card_bg") or form.get("form_card_bg") or "rgba(255,255,255,.06)"
-    label_color = payload.get("label_color") or form.get("label_color") or "#fafafa"
-    button_bg = payload.get("button_bg") or form.get("button_bg") or "#8ab4f8"
-    button_text = payload.get("button_text") or form.get("button_text") or "#000000"
-    hide_payment_option = bool(payload.get("hide_payment_option") if payload.get("hide_payment_option") is not None else form.get("hide_payment_option") or False)
-    allow_in_studio = bool(payload.get("allow_in_studio") if payload.get("allow_in_studio") is not None else form.get("allow_in_studio") or False)
-    title = payload.get("title") or form.get("title") or "Book a Photoshoot"
-    subtitle = payload.get("subtitle") or form.get("subtitle") or "Fill this form here"
-    input_radius = int(payload.get("input_radius") if payload.get("input_radius") is not None else form.get("input_radius") or 10)
-    title_align = str(payload.get("title_align") or form.get("title_align") or "center").lower()
-    if title_align not in ("left","center","right"): title_align = "center"
-    subtitle_align = str(payload.get("subtitle_align") or form.get("subtitle_align") or "center").lower()
-    if subtitle_align not in ("left","center","right"): subtitle_align = "center"
-    try:
-        title_size = int(payload.get("title_size") if payload.get("title_size") is not None else form.get("title_size") or 28)
-    except Exception:
-        title_size = 28
-    try:
-        subtitle_size = int(payload.get("subtitle_size") if payload.get("subtitle_size") is not None else form.get("subtitle_size") or 14)
-    except Exception:
-        subtitle_size = 14
-    title_font = str(payload.get("title_font") or form.get("title_font") or "Inter")
-    subtitle_font = str(payload.get("subtitle_font") or form.get("subtitle_font") or "Inter")
-    label_font = str(payload.get("label_font") or form.get("label_font") or "Inter")
-    try:
-        label_size = int(payload.get("label_size") if payload.get("label_size") is not None else form.get("label_size") or 14)
-    except Exception:
-        label_size = 14
-    # Submit label + custom fonts
-    submit_label = str(payload.get("submit_label") or form.get("submit_label") or "Request Booking")
-    title_font_data = str(payload.get("title_font_data") or form.get("title_font_data") or "")
-    subtitle_font_data = str(payload.get("subtitle_font_data") or form.get("subtitle_font_data") or "")
-    label_font_data = str(payload.get("label_font_data") or form.get("label_font_data") or "")
-    # Studio + Maps settings
-    studio_address = str(payload.get("studio_address") or form.get("studio_address") or "")
-    studio_lat = str(payload.get("studio_lat") or form.get("studio_lat") or "")
-    studio_lng = str(payload.get("studio_lng") or form.get("studio_lng") or "")
-    maps_api_key = str(payload.get("maps_api_key") or form.get("maps_api_key") or "")
-    # template removed
-
-    form.update({
-        "background_color": str(bg),
-        "form_card_bg": str(form_card_bg),
-        "label_color": str(label_color),
-        "button_bg": str(button_bg),
-        "button_text": str(button_text),
-        "hide_payment_option": bool(hide_payment_option),
-        "allow_in_studio": bool(allow_in_studio),
-        "title": str(title),
-        "subtitle": str(subtitle),
-        "title_align": title_align,
-        "subtitle_align": subtitle_align,
-        "title_size": int(max(8, min(96, title_size))),
-        "subtitle_size": int(max(8, min(48, subtitle_size))),
-        "title_font": str(title_font),
-        "subtitle_font": str(subtitle_font),
-        "label_font": str(label_font),
-        "label_size": int(max(8, min(48, label_size))),
-        "input_radius": int(max(0, min(32, input_radius))),
-        "submit_label": submit_label,
-        "title_font_data": title_font_data,
-        "subtitle_font_data": subtitle_font_data,
-        "label_font_data": label_font_data,
-        "studio_address": studio_address,
-        "studio_lat": studio_lat,
-        "studio_lng": studio_lng,
-        "maps_api_key": maps_api_key,
-        "updated_at": int(time.time()),
-    })
-    write_json_key(_user_form_key(eff_uid), form)
+    # One pass over the field table: payload wins, then the saved value, then the default
+    for key, default, cast in _FORM_FIELDS:
+        v = payload.get(key)
+        if v is None or v == "":
+            v = form.get(key)
+            if v is None or v == "":
+                v = default
+        form[key] = cast(v)
+    # Autosave often re-posts identical settings; skip the storage PUT when nothing changed
+    if form == before:
+        return form
+    form["updated_at"] = int(time.time())
+    await asyncio.to_thread(_cached_write_json, _user_form_key(eff_uid), form)
+    _drop_form_pages(form["form_id"])
     return form
 
 
 # --------- Public embed page (for iframe) ---------
 
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def _qp_bool(qp, key: str) -> bool:
+    v = qp.get(key)
+    return v is not None and v.lower() in _TRUTHY
+
+
+def _qp_or_form(qp: Dict[str, str], form: Dict[str, Any], key: str, default: Any) -> Any:
+    # Query string overrides the saved form
+    return qp.get(key) or form.get(key) or default
+
+
 @router.get("/public/{form_id}")
 async def public_booking_form(form_id: str, request: Request):
     # Resolve owner uid
-    reg = read_json_key(_form_registry_key(form_id)) or {}
-    uid = reg.get("user_uid")
+    uid = await asyncio.to_thread(_form_owner, form_id)
     if not uid:
         return HTMLResponse("<h1>Form not found</h1>", status_code=404)
-    form = read_json_key(_user_form_key(uid)) or {}
+    form = await asyncio.to_thread(_cached_read_json, _user_form_key(uid)) or {}
     bg = form.get("background_color") or "#0b0b0c"
     form_card_bg = form.get("form_card_bg") or "rgba(255,255,255,.06)"
     label_color = form.get("label_color") or "#fafafa"
@@ -202,86 +299,40 @@ async def public_booking_form(form_id: str, request: Request):
     hide_payment_option = bool(form.get("hide_payment_option") or False)
     allow_in_studio = bool(form.get("allow_in_studio") or False)
     # templates removed; always render split layout
+    qp = dict(request.query_params)
     # Default date prefill through query param ?date=YYYY-MM-DD
-    try:
-        default_date = str(request.query_params.get("date") or "").strip()
-    except Exception:
-        default_date = ""
-    try:
-        input_radius = int(request.query_params.get("input_radius") or form.get("input_radius") or 10)
-    except Exception:
-        input_radius = 10
+    default_date = (qp.get("date") or "").strip()
+    input_radius = _to_int(_qp_or_form(qp, form, "input_radius", 10), 10, 0, 32)
     # Flags
-    def _qp_bool(key: str) -> bool:
-        try:
-            v = request.query_params.get(key)
-            return bool(str(v).lower() in ("1","true","yes","on")) if v is not None else False
-        except Exception:
-            return False
-
-    full_form = _qp_bool("full_form")
-    no_cta = _qp_bool("no_cta")
+    full_form = _qp_bool(qp, "full_form")
+    no_cta = _qp_bool(qp, "no_cta")
 
     # Resolve title/subtitle (query overrides saved form)
-    try:
-        title_text = str(request.query_params.get("title") or form.get("title") or "Book a Photoshoot")
-    except Exception:
-        title_text = "Book a Photoshoot"
-    try:
-        subtitle_text = str(request.query_params.get("subtitle") or form.get("subtitle") or "Fill this form here")
-    except Exception:
-        subtitle_text = "Fill this form here"
+    title_text = str(_qp_or_form(qp, form, "title", "Book a Photoshoot"))
+    subtitle_text = str(_qp_or_form(qp, form, "subtitle", "Fill this form here"))
 
     # Title/subtitle appearance overrides
-    try:
-        title_align = str(request.query_params.get("title_align") or form.get("title_align") or "center").lower()
-        if title_align not in ("left","center","right"): title_align = "center"
-    except Exception:
-        title_align = "center"
-    try:
-        subtitle_align = str(request.query_params.get("subtitle_align") or form.get("subtitle_align") or "center").lower()
-        if subtitle_align not in ("left","center","right"): subtitle_align = "center"
-    except Exception:
-        subtitle_align = "center"
-    try:
-        title_size = int(request.query_params.get("title_size") or form.get("title_size") or 28)
-    except Exception:
-        title_size = 28
-    try:
-        subtitle_size = int(request.query_params.get("subtitle_size") or form.get("subtitle_size") or 14)
-    except Exception:
-        subtitle_size = 14
-    try:
-        title_font = str(request.query_params.get("title_font") or form.get("title_font") or "Inter")
-    except Exception:
-        title_font = "Inter"
-    try:
-        subtitle_font = str(request.query_params.get("subtitle_font") or form.get("subtitle_font") or "Inter")
-    except Exception:
-        subtitle_font = "Inter"
-    try:
-        label_font = str(request.query_params.get("label_font") or form.get("label_font") or "Inter")
-    except Exception:
-        label_font = "Inter"
-    try:
-        label_size = int(request.query_params.get("label_size") or form.get("label_size") or 14)
-    except Exception:
-        label_size = 14
+    title_align = _align(_qp_or_form(qp, form, "title_align", "center"))
+    subtitle_align = _align(_qp_or_form(qp, form, "subtitle_align", "center"))
+    title_size = _to_int(_qp_or_form(qp, form, "title_size", 28), 28, 8, 96)
+    subtitle_size = _to_int(_qp_or_form(qp, form, "subtitle_size", 14), 14, 8, 48)
+    title_font = str(_qp_or_form(qp, form, "title_font", "Inter"))
+    subtitle_font = str(_qp_or_form(qp, form, "subtitle_font", "Inter"))
+    label_font = str(_qp_or_form(qp, form, "label_font", "Inter"))
+    label_size = _to_int(_qp_or_form(qp, form, "label_size", 14), 14, 8, 48)
 
-    try:
-        submit_label = str(request.query_params.get("submit_label") or form.get("submit_label") or "Request Booking")
-    except Exception:
-        submit_label = "Request Booking"
+    submit_label = str(_qp_or_form(qp, form, "submit_label", "Request Booking"))
 
     # Studio/maps from saved form or query overrides
-    maps_api_key = str(request.query_params.get("maps_api_key") or form.get("maps_api_key") or "")
-    studio_address = str(request.query_params.get("studio_address") or form.get("studio_address") or "")
-    studio_lat = str(request.query_params.get("studio_lat") or form.get("studio_lat") or "")
-    studio_lng = str(request.query_params.get("studio_lng") or form.get("studio_lng") or "")
-
-    html = _render_modern_form_html(
-        form_id=form_id,
-        default_date=default_date,
+    maps_api_key = str(_qp_or_form(qp, form, "maps_api_key", ""))
+    studio_address = str(_qp_or_form(qp, form, "studio_address", ""))
+    studio_lat = str(_qp_or_form(qp, form, "studio_lat", ""))
+    studio_lng = str(_qp_or_form(qp, form, "studio_lng", ""))
+
+    html = _render_public_form_bytes(
+        form_id,
+        form.get("updated_at"),
+        default_date,
         title_text=title_text,
         subtitle_text=subtitle_text,
         accent=label_color,
@@ -305,170 +356,125 @@ async def public_booking_form(form_id: str, request: Request):
         subtitle_font_data=str(form.get("subtitle_font_data") or ""),
         label_font_data=str(form.get("label_font_data") or ""),
     )
-    return HTMLResponse(html)
+    return HTMLResponse(content=html, media_type="text/html")
 
 
-def _render_modern_form_html(
-    form_id: str,
-    default_date: str = "",
-    *,
-    title_text: str = "Book a Photoshoot",
-    subtitle_text: str = "Fill this form here",
-    accent: str = "#111827",       # dark gray text
-    bg: str = "#ffffff",           # light/white background
-    card_bg: str = "#f9fafb",      # light gray card
-    accent_button: str = "#111827",
-    accent_button_text: str = "#ffffff",
-    allow_in_studio: bool = False,
-    hide_payment_option: bool = False,
-    input_radius: int = 10,
-    title_align: str = "center",
-    subtitle_align: str = "center",
-    title_size: int = 28,
-    subtitle_size: int = 14,
-    title_font: str = "Inter",
-    subtitle_font: str = "Inter",
-    label_font: str = "Inter",
-    label_size: int = 14,
-    submit_label: str = "Request Booking",
-    title_font_data: str = "",
-    subtitle_font_data: str = "",
-    label_font_data: str = "",
-    studio_address: str = "",
-    studio_lat: str = "",
-    studio_lng: str = "",
-    maps_api_key: str = "",
-) -> str:
-    # Build Google Fonts link tags for requested families (simple sanitization)
-    def _safe_font(f: str) -> str:
-        try:
-            return "".join(ch for ch in f if ch.isalnum() or ch in (" ", "+", "-")) or "Inter"
-        except Exception:
-            return "Inter"
-    families = []
-    for fam in (str(title_font), str(subtitle_font), str(label_font), 'Inter'):
-        sf = _safe_font(fam)
-        if sf and sf not in families:
-            families.append(sf)
-    font_links = "\n        ".join([
-        f'<link href="https://fonts.googleapis.com/css2?family={fn.replace(" ", "+")}:wght@400;600&display=swap" rel="stylesheet"/>'
-        for fn in families
-    ])
+# Rendered public pages, LRU-bounded. The key is the form id, its saved updated_at
+# and the non-font render arguments: uploaded font data URLs only ever come from the
+# saved form, so updated_at already covers them without hashing megabytes per hit.
+_PAGE_CACHE = TTLCache(maxsize=256, ttl=3600)
+_FONT_DATA_KEYS = frozenset(("title_font_data", "subtitle_font_data", "label_font_data"))
 
-    maps_script = f"<script src=\"https://maps.googleapis.com/maps/api/js?key={maps_api_key}&libraries=places\"></script>" if maps_api_key else ""
 
-    # Custom @font-face from uploaded Data URLs
-    custom_fonts_css = ""
-    if title_font_data:
-        custom_fonts_css += f"""
-        @font-face {{
-            font-family: 'CustomTitleFont';
-            src: url({title_font_data});
-            font-weight: 400 700;
-            font-style: normal;
-            font-display: swap;
-        }}
-        """
-    if subtitle_font_data:
-        custom_fonts_css += f"""
-        @font-face {{
-            font-family: 'CustomSubtitleFont';
-            src: url({subtitle_font_data});
-            font-weight: 400 700;
-            font-style: normal;
-            font-display: swap;
-        }}
-        """
-    if label_font_data:
-        custom_fonts_css += f"""
-        @font-face {{
-            font-family: 'CustomLabelFont';
-            src: url({label_font_data});
-            font-weight: 400 700;
-            font-style: normal;
-            font-display: swap;
-        }}
-        """
+def _render_modern_form_bytes(form_id: str, default_date: str = "", **kwargs) -> bytes:
+    return _render_modern_form_html(form_id, default_date, **kwargs).encode("utf-8")
+
+
+def _render_public_form_bytes(form_id: str, version: Any, default_date: str, **kwargs) -> bytes:
+    key = (form_id, version, default_date) + tuple(
+        (k, v) for k, v in kwargs.items() if k not in _FONT_DATA_KEYS
+    )
+    html = _PAGE_CACHE.get(key)
+    if html is None:
+        html = _render_modern_form_bytes(form_id, default_date, **kwargs)
+        _PAGE_CACHE.put(key, html)
+    return html
 
-    css = f"""
-    * {{ box-sizing: border-box; }}
-    body {{
+
+def _drop_form_pages(form_id: str) -> None:
+    # updated_at has one-second resolution, so purge explicitly on save as well
+    _PAGE_CACHE.pop_matching(lambda key: key[0] == form_id)
+
+
+# Fixed document scaffolding up to the (per-form) <title> text
+_HEAD_PREFIX = """
+    <!doctype html>
+    <html>
+      <head>
+        <meta charset='utf-8'/>
+        <meta name='viewport' content='width=device-width,initial-scale=1'/>
+        <title>"""
+
+# Static form stylesheet; only the appearance tokens are substituted per render
+_CSS_TMPL = Template("""
+    * { box-sizing: border-box; }
+    body {
         margin: 0;
         font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-        background: {bg};
-        color: {accent};
+        background: $bg;
+        color: $accent;
         line-height: 1.6;
         padding: 40px 20px;
-    }}
-    .container {{
+    }
+    .container {
         max-width: 600px;
         margin: 0 auto;
-    }}
-    .title-card {{
-        background: {card_bg};
+    }
+    .title-card {
+        background: $card_bg;
         border-radius: 16px;
         padding: 20px 24px;
         box-shadow: 0 6px 18px rgba(0,0,0,0.08);
         margin-bottom: 20px;
-    }}
-    h1 {{
-        font-size: {int(max(8, min(96, title_size)))}px;
+    }
+    h1 {
+        font-size: ${title_size}px;
         font-weight: 600;
         margin: 0 0 8px 0;
-        text-align: {title_align};
-        font-family: {"'CustomTitleFont', " if title_font_data else ''}'{_safe_font(title_font)}', 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-    }}
-    .subtitle {{
-        text-align: {subtitle_align};
-        font-size: {int(max(8, min(48, subtitle_size)))}px;
-        font-family: {"'CustomSubtitleFont', " if subtitle_font_data else ''}'{_safe_font(subtitle_font)}', 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-    }}
-    .form-card {{
-        background: {card_bg};
+        text-align: $title_align;
+        font-family: $title_family, 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
+    }
+    .subtitle {
+        text-align: $subtitle_align;
+        font-size: ${subtitle_size}px;
+        font-family: $subtitle_family, 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
+    }
+    .form-card {
+        background: $card_bg;
         border-radius: 16px;
         padding: 32px;
         box-shadow: 0 6px 18px rgba(0,0,0,0.08);
-    }}
-    .map-wrap {{
+    }
+    .map-wrap {
         margin-top: 8px;
-    }}
-    #map {{
+    }
+    #map {
         width: 100%;
         height: 240px;
         border-radius: 12px;
         border: 1px solid #d1d5db;
-    }}
-    .muted {{
+    }
+    .muted {
         color: #6b7280;
         font-size: 13px;
-    }}
-    .field {{
+    }
+    .field {
         margin-bottom: 20px;
-    }}
-    .field label {{
-        font-size: {int(max(8, min(48, label_size)))}px;
+    }
+    .field label {
+        font-size: ${label_size}px;
         font-weight: 500;
         margin-bottom: 6px;
         display: block;
-        font-family: {"'CustomLabelFont', " if label_font_data else ''}'{_safe_font(label_font)}', 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-    }}
-    .field input, .field textarea, .field select {{
+        font-family: $label_family, 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
+    }
+    .field input, .field textarea, .field select {
         width: 100%;
         padding: 12px 14px;
         border: 1px solid #d1d5db;
-        border-radius: {int(max(0, min(32, input_radius)))}px;
+        border-radius: ${input_radius}px;
         background: #fff;
         font-size: 15px;
         transition: border 0.2s;
-    }}
-    .field input:focus, .field textarea:focus, .field select:focus {{
+    }
+    .field input:focus, .field textarea:focus, .field select:focus {
         outline: none;
-        border-color: {accent};
-    }}
-    button {{
+        border-color: $accent;
+    }
+    button {
         width: 100%;
-        background: {accent_button};
-        color: {accent_button_text};
+        background: $accent_button;
+        color: $accent_button_text;
         font-weight: 600;
         border: none;
         padding: 14px;
@@ -476,17 +482,18 @@ def _render_modern_form_html(
         font-size: 16px;
         cursor: pointer;
         transition: background 0.2s;
-    }}
-    button:hover {{
+    }
+    button:hover {
         background: #000;
-    }}
-    .note {{
+    }
+    .note {
         margin-top: 0;
         opacity: 0.85;
-    }}
-    """
+    }
+    """)
+
 
-    payment_html = "" if hide_payment_option else """
+_PAYMENT_HTML = """
         <div class='field'>
             <label>Payment Option</label>
             <select name='payment_option'>
@@ -495,32 +502,23 @@ def _render_modern_form_html(
             </select>
         </div>
     """
+_IN_STUDIO_TOGGLE = "<label style='margin-right:12px'><input type='checkbox' id='inStudio'/> In studio</label>"
 
-    studio_html = (
-        "<div class='field'><label><input type='checkbox' name='studio'/> In studio</label></div>"
-        if allow_in_studio else ""
-    )
-
-    html = f"""
-    <!doctype html>
-    <html>
-      <head>
-        <meta charset='utf-8'/>
-        <meta name='viewport' content='width=device-width,initial-scale=1'/>
-        <title>{title_text}</title>
-        {font_links}
-        {maps_script}
-        <style>{custom_fonts_css}{css}</style>
+# Page body after <title>; JS braces are literal, only $-placeholders are filled per render
+_PAGE_TMPL = Template("""${title_text}</title>
+        ${font_links}
+        ${maps_script}
+        <style>${custom_fonts_css}${css}</style>
       </head>
       <body>
         <div class="container">
           <div class="title-card">
-            <h1>{title_text}</h1>
-            <div class='note subtitle'>{subtitle_text}</div>
+            <h1>${title_text}</h1>
+            <div class='note subtitle'>${subtitle_text}</div>
           </div>
           <div class="form-card">
             <form method='POST' action='/api/booking/submit' onsubmit='return onSubmit(event)'>
-              <input type='hidden' name='form_id' value='{form_id}'/>
+              <input type='hidden' name='form_id' value='${form_id}'/>
               <div class='field'>
                 <label>Name</label>
                 <input name='client_name' placeholder='Your full name' required/>
@@ -535,17 +533,17 @@ def _render_modern_form_html(
               </div>
               <div class='field'>
                 <label>Preferred Date</label>
-                <input type='date' name='date' value='{default_date}' required/>
+                <input type='date' name='date' value='${default_date}' required/>
               </div>
               <div class='field'>
                 <label>Message</label>
                 <textarea name='service_details' rows='4' placeholder='What kind of session are you interested in?'></textarea>
               </div>
-              {payment_html}
+              ${payment_html}
               <div class='field'>
                 <label>Location</label>
                 <div>
-                  {"" if not allow_in_studio else "<label style='margin-right:12px'><input type='checkbox' id='inStudio'/> In studio</label>"}
+                  ${in_studio_toggle}
                   <label><input type='checkbox' id='customLoc'/> Custom location</label>
                 </div>
                 <input id='placeInput' type='text' placeholder='Type a place or address' style='display:none;margin-top:8px;width:100%;padding:10px;border:1px solid #d1d5db;border-radius:8px' />
@@ -555,12 +553,12 @@ def _render_modern_form_html(
                 <input type='hidden' name='latitude' id='latField'/>
                 <input type='hidden' name='longitude' id='lngField'/>
               </div>
-              <button type='submit'>{submit_label}</button>
+              <button type='submit'>${submit_label}</button>
               <div id='msg' class='note'></div>
             </form>
           </div>
           <script>
-            (function() {{
+            (function() {
               let map = null, marker = null, autocomplete = null;
               const inStudioCb = document.getElementById('inStudio');
               const customCb = document.getElementById('customLoc');
@@ -568,136 +566,267 @@ def _render_modern_form_html(
               const locField = document.getElementById('locField');
               const latField = document.getElementById('latField');
               const lngField = document.getElementById('lngField');
-              const studio = {{
-                address: {repr(studio_address)},
-                lat: parseFloat({repr(studio_lat)}) || null,
-                lng: parseFloat({repr(studio_lng)}) || null,
-              }};
+              const studio = {
+                address: ${studio_address},
+                lat: parseFloat(${studio_lat}) || null,
+                lng: parseFloat(${studio_lng}) || null,
+              };
 
-              function setMarker(pos, title) {{
+              function setMarker(pos, title) {
                 if (!map) return;
-                if (!marker) marker = new google.maps.Marker({{ map }});
+                if (!marker) marker = new google.maps.Marker({ map });
                 marker.setPosition(pos);
                 if (title) marker.setTitle(title);
                 map.setCenter(pos);
-              }}
+              }
 
-              function useStudio() {{
-                if (studio.lat && studio.lng) {{
-                  const pos = {{ lat: studio.lat, lng: studio.lng }};
+              function useStudio() {
+                if (studio.lat && studio.lng) {
+                  const pos = { lat: studio.lat, lng: studio.lng };
                   setMarker(pos, studio.address || 'Studio');
                   locField.value = studio.address || 'Studio';
                   latField.value = String(studio.lat);
                   lngField.value = String(studio.lng);
-                }} else {{
+                } else {
                   // No studio set — clear fields
                   locField.value = '';
                   latField.value = '';
                   lngField.value = '';
-                }}
-              }}
+                }
+              }
 
-              window.onSubmit = async function(e) {{
+              window.onSubmit = async function(e) {
                 // Validate: if custom is checked ensure coords present
-                if (customCb && customCb.checked) {{
-                  if (!latField.value || !lngField.value) {{
+                if (customCb && customCb.checked) {
+                  if (!latField.value || !lngField.value) {
                     e.preventDefault();
                     alert('Please select a custom location on the map.');
                     return false;
-                  }}
-                }}
+                  }
+                }
 
                 // Submit via fetch to keep the form on the page and show a message
                 e.preventDefault();
                 const form = e.target;
                 const msgEl = document.getElementById('msg');
                 if (msgEl) msgEl.textContent = 'Sending...';
-                try {{
-                  const res = await fetch(form.action || '/api/booking/submit', {{
+                try {
+                  const res = await fetch(form.action || '/api/booking/submit', {
                     method: 'POST',
                     body: new FormData(form),
                     credentials: 'same-origin'
-                  }});
+                  });
                   let data = null;
-                  try {{ data = await res.json(); }} catch(_err) {{ data = null; }}
-                  if (res.ok && data && data.ok) {{
+                  try { data = await res.json(); } catch(_err) { data = null; }
+                  if (res.ok && data && data.ok) {
                     if (msgEl) msgEl.textContent = 'Thank you! Your request has been sent.';
-                  }} else {{
+                  } else {
                     if (msgEl) msgEl.textContent = 'Something went wrong. Please try again.';
-                  }}
-                }} catch (err) {{
+                  }
+                } catch (err) {
                   if (msgEl) msgEl.textContent = 'Network error. Please try again.';
-                }}
+                }
                 return false;
-              }}
+              }
 
-              function init() {{
+              function init() {
                 const mapEl = document.getElementById('map');
                 if (!mapEl) return;
                 const hasMaps = !!(window.google && window.google.maps);
-                const start = {{ lat: 37.7749, lng: -122.4194 }}; // fallback
-                map = hasMaps ? new google.maps.Map(mapEl, {{ center: start, zoom: 12 }}) : null;
-                if (hasMaps) {{ marker = new google.maps.Marker({{ map }}); }}
+                const start = { lat: 37.7749, lng: -122.4194 }; // fallback
+                map = hasMaps ? new google.maps.Map(mapEl, { center: start, zoom: 12 }) : null;
+                if (hasMaps) { marker = new google.maps.Marker({ map }); }
 
-                if (hasMaps && placeInput) {{
-                  autocomplete = new google.maps.places.Autocomplete(placeInput, {{ fields: ['formatted_address','geometry'] }});
-                  autocomplete.addListener('place_changed', () => {{
+                if (hasMaps && placeInput) {
+                  autocomplete = new google.maps.places.Autocomplete(placeInput, { fields: ['formatted_address','geometry'] });
+                  autocomplete.addListener('place_changed', () => {
                     const p = autocomplete.getPlace();
-                    if (p && p.geometry && p.geometry.location) {{
-                      const pos = {{ lat: p.geometry.location.lat(), lng: p.geometry.location.lng() }};
+                    if (p && p.geometry && p.geometry.location) {
+                      const pos = { lat: p.geometry.location.lat(), lng: p.geometry.location.lng() };
                       setMarker(pos, p.formatted_address || 'Location');
                       locField.value = p.formatted_address || '';
                       latField.value = String(pos.lat);
                       lngField.value = String(pos.lng);
-                    }}
-                  }});
-                }}
+                    }
+                  });
+                }
 
-                if (inStudioCb) {{
-                  inStudioCb.addEventListener('change', () => {{
-                    if (inStudioCb.checked) {{
+                if (inStudioCb) {
+                  inStudioCb.addEventListener('change', () => {
+                    if (inStudioCb.checked) {
                       if (customCb) customCb.checked = false;
                       placeInput && (placeInput.style.display = 'none');
                       useStudio();
-                    }} else {{
+                    } else {
                       // Cleared
-                      if (!customCb || !customCb.checked) {{
+                      if (!customCb || !customCb.checked) {
                         locField.value = latField.value = lngField.value = '';
-                      }}
-                    }}
-                  }});
-                }}
-
-                if (customCb) {{
-                  customCb.addEventListener('change', () => {{
-                    if (customCb.checked) {{
+                      }
+                    }
+                  });
+                }
+
+                if (customCb) {
+                  customCb.addEventListener('change', () => {
+                    if (customCb.checked) {
                       if (inStudioCb) inStudioCb.checked = false;
                       placeInput && (placeInput.style.display = 'block');
                       placeInput && placeInput.focus();
                       // Clear until user picks
                       locField.value = latField.value = lngField.value = '';
-                    }} else {{
+                    } else {
                       placeInput && (placeInput.style.display = 'none');
-                      if (!inStudioCb || !inStudioCb.checked) {{
+                      if (!inStudioCb || !inStudioCb.checked) {
                         locField.value = latField.value = lngField.value = '';
-                      }}
-                    }}
-                  }});
-                }}
+                      }
+                    }
+                  });
+                }
 
                 // Initialize default selection
                 if (inStudioCb && inStudioCb.checked) useStudio();
-              }}
+              }
 
-              if (document.readyState === 'loading') {{
+              if (document.readyState === 'loading') {
                 document.addEventListener('DOMContentLoaded', init);
-              }} else {{ init(); }}
-            }})();
+              } else { init(); }
+            })();
           </script>
         </div>
       </body>
     </html>
-    """
+    """)
+
+
+# ASCII characters stripped from font family names (everything but alnum, space, '+', '-')
+_FONT_DROP = {c: None for c in range(128) if not (chr(c).isalnum() or chr(c) in " +-")}
+
+
+def _safe_font(f: str) -> str:
+    # Simple sanitization for font family names
+    try:
+        if f.isascii():
+            return f.translate(_FONT_DROP) or "Inter"
+        return "".join(ch for ch in f if ch.isalnum() or ch in (" ", "+", "-")) or "Inter"
+    except Exception:
+        return "Inter"
+
+
+@lru_cache(maxsize=256)
+def _font_links(title_font: str, subtitle_font: str, label_font: str) -> str:
+    # Google Fonts link tags for the requested families (deduped, Inter always included)
+    families = []
+    for fam in (title_font, subtitle_font, label_font, 'Inter'):
+        sf = _safe_font(fam)
+        if sf and sf not in families:
+            families.append(sf)
+    return "\n        ".join([
+        f'<link href="https://fonts.googleapis.com/css2?family={fn.replace(" ", "+")}:wght@400;600&display=swap" rel="stylesheet"/>'
+        for fn in families
+    ])
+
+
+def _render_modern_form_html(
+    form_id: str,
+    default_date: str = "",
+    *,
+    title_text: str = "Book a Photoshoot",
+    subtitle_text: str = "Fill this form here",
+    accent: str = "#111827",       # dark gray text
+    bg: str = "#ffffff",           # light/white background
+    card_bg: str = "#f9fafb",      # light gray card
+    accent_button: str = "#111827",
+    accent_button_text: str = "#ffffff",
+    allow_in_studio: bool = False,
+    hide_payment_option: bool = False,
+    input_radius: int = 10,
+    title_align: str = "center",
+    subtitle_align: str = "center",
+    title_size: int = 28,
+    subtitle_size: int = 14,
+    title_font: str = "Inter",
+    subtitle_font: str = "Inter",
+    label_font: str = "Inter",
+    label_size: int = 14,
+    submit_label: str = "Request Booking",
+    title_font_data: str = "",
+    subtitle_font_data: str = "",
+    label_font_data: str = "",
+    studio_address: str = "",
+    studio_lat: str = "",
+    studio_lng: str = "",
+    maps_api_key: str = "",
+) -> str:
+    font_links = _font_links(str(title_font), str(subtitle_font), str(label_font))
+
+    maps_script = f"<script src=\"https://maps.googleapis.com/maps/api/js?key={maps_api_key}&libraries=places\"></script>" if maps_api_key else ""
+
+    # Custom @font-face from uploaded Data URLs
+    custom_fonts_css = ""
+    if title_font_data:
+        custom_fonts_css += f"""
+        @font-face {{
+            font-family: 'CustomTitleFont';
+            src: url({title_font_data});
+            font-weight: 400 700;
+            font-style: normal;
+            font-display: swap;
+        }}
+        """
+    if subtitle_font_data:
+        custom_fonts_css += f"""
+        @font-face {{
+            font-family: 'CustomSubtitleFont';
+            src: url({subtitle_font_data});
+            font-weight: 400 700;
+            font-style: normal;
+            font-display: swap;
+        }}
+        """
+    if label_font_data:
+        custom_fonts_css += f"""
+        @font-face {{
+            font-family: 'CustomLabelFont';
+            src: url({label_font_data});
+            font-weight: 400 700;
+            font-style: normal;
+            font-display: swap;
+        }}
+        """
+
+    css = _CSS_TMPL.substitute(
+        bg=bg,
+        accent=accent,
+        card_bg=card_bg,
+        accent_button=accent_button,
+        accent_button_text=accent_button_text,
+        title_align=title_align,
+        subtitle_align=subtitle_align,
+        title_size=_clamp(int(title_size), 8, 96),
+        subtitle_size=_clamp(int(subtitle_size), 8, 48),
+        label_size=_clamp(int(label_size), 8, 48),
+        input_radius=_clamp(int(input_radius), 0, 32),
+        title_family=("'CustomTitleFont', " if title_font_data else "") + f"'{_safe_font(title_font)}'",
+        subtitle_family=("'CustomSubtitleFont', " if subtitle_font_data else "") + f"'{_safe_font(subtitle_font)}'",
+        label_family=("'CustomLabelFont', " if label_font_data else "") + f"'{_safe_font(label_font)}'",
+    )
+
+    html = _HEAD_PREFIX + _PAGE_TMPL.substitute(
+        title_text=title_text,
+        font_links=font_links,
+        maps_script=maps_script,
+        custom_fonts_css=custom_fonts_css,
+        css=css,
+        subtitle_text=subtitle_text,
+        form_id=form_id,
+        default_date=default_date,
+        payment_html="" if hide_payment_option else _PAYMENT_HTML,
+        in_studio_toggle=_IN_STUDIO_TOGGLE if allow_in_studio else "",
+        submit_label=submit_label,
+        studio_address=repr(studio_address),
+        studio_lat=repr(studio_lat),
+        studio_lng=repr(studio_lng),
+    )
     return html
 
 
@@ -722,23 +851,14 @@ async def preview_booking(request: Request):
     button_text = _pick("button_text", "btn_text", default="#001014")
     date = _pick("date", default="")
 
-    def _bool(key: str) -> bool:
-        v = qp.get(key)
-        if v is None:
-            return False
-        return str(v).lower() in ("1", "true", "yes", "on")
-
-    hide_payment_option = _bool("hide_payment_option")
-    allow_in_studio = _bool("allow_in_studio")
-    full_form = _bool("full_form")
-    no_cta = _bool("no_cta")
+    hide_payment_option = _qp_bool(qp, "hide_payment_option")
+    allow_in_studio = _qp_bool(qp, "allow_in_studio")
+    full_form = _qp_bool(qp, "full_form")
+    no_cta = _qp_bool(qp, "no_cta")
 
     title_text = _pick("title", default="Book a Photoshoot")
     subtitle_text = _pick("subtitle", default="Fill this form here")
-    try:
-        input_radius = int(_pick("input_radius", default="10"))
-    except Exception:
-        input_radius = 10
+    input_radius = _to_int(_pick("input_radius", default="10"), 10, 0, 32)
     submit_label = _pick("submit_label", default="Request Booking")
 
     maps_api_key = _pick("maps_api_key", default="")
@@ -751,25 +871,17 @@ async def preview_booking(request: Request):
     title_align = _ta if _ta in ("left","center","right") else "center"
     _sa = _pick("subtitle_align", default="center").lower()
     subtitle_align = _sa if _sa in ("left","center","right") else "center"
-    try:
-        title_size = int(_pick("title_size", default="28"))
-    except Exception:
-        title_size = 28
-    try:
-        subtitle_size = int(_pick("subtitle_size", default="14"))
-    except Exception:
-        subtitle_size = 14
-    try:
-        label_size = int(_pick("label_size", default="14"))
-    except Exception:
-        label_size = 14
+    title_size = _to_int(_pick("title_size", default="28"), 28, 8, 96)
+    subtitle_size = _to_int(_pick("subtitle_size", default="14"), 14, 8, 48)
+    label_size = _to_int(_pick("label_size", default="14"), 14, 8, 48)
     title_font = _pick("title_font", default="Inter")
     subtitle_font = _pick("subtitle_font", default="Inter")
     label_font = _pick("label_font", default="Inter")
     title_font_data = _pick("title_font_data", default="")
     subtitle_font_data = _pick("subtitle_font_data", default="")
 
-    html = _render_modern_form_html(
+    # Not cached: previews carry arbitrary (possibly large) font data in the query string
+    html = _render_modern_form_bytes(
         form_id="preview",
         default_date=date,
         title_text=title_text,
@@ -798,30 +910,115 @@ async def preview_booking(request: Request):
         studio_lng=studio_lng,
         maps_api_key=maps_api_key,
     )
-    return HTMLResponse(html)
+    return HTMLResponse(content=html, media_type="text/html")
 
 # templates endpoint removed
 
 
 # --------- Public submit (no auth) ---------
 
+# Dashboard link target in owner notifications
+_FRONT_ORIGIN = (os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip() or "https://photomark.cloud").rstrip("/")
+
+class BookingSubmit(BaseModel):
+    # Public form post; pydantic-core trims every field during validation
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    form_id: str
+    client_name: str
+    email: str
+    phone: str
+    service_details: str = ""
+    date: str
+    payment_option: str = "online"
+    location: str = ""
+    latitude: Optional[str] = None
+    longitude: Optional[str] = None
+
+
+def _notify_owner(uid: str, record: Dict[str, Any]):
+    client_name = record.get("client_name") or ""
+    email = record.get("email") or ""
+    phone = record.get("phone") or ""
+    date = record.get("date") or ""
+    service_details = record.get("service_details") or ""
+    booking_id = record.get("id") or ""
+    try:
+        owner_email, _ = _owner_contact(uid)
+        if owner_email:
+            subject = f"New booking request from {client_name or email}"
+            dash_url = f"{_FRONT_ORIGIN}/#booking"
+            parts = [
+                "A new booking request was submitted via your form.<br><br>",
+                f"<strong>Name:</strong> {_esc(client_name)}<br>",
+                f"<strong>Email:</strong> <a href='mailto:{email}'>{_esc(email)}</a><br>",
+                f"<strong>Phone:</strong> {_esc(phone)}<br>",
+                f"<strong>Date:</strong> {_esc(date)}<br>",
+                f"<strong>Payment:</strong> {_esc(record.get('payment_option'))}<br>",
+            ]
+            if record.get('location'):
+                parts.append(f"<strong>Location:</strong> {_esc(record.get('location'))}<br>")
+            if service_details:
+                parts.append(f"<strong>Message:</strong><br>{_esc(service_details)}")
+            intro = "".join(parts)
+            html = render_email(
+                "email_basic.html",
+                title="New booking request",
+                intro=intro,
+                button_label="Open Booking",
+                button_url=dash_url,
+                footer_note=f"Request ID: {booking_id}",
+            )
+            text = (
+                "New booking request\n"
+                f"Name: {client_name}\n"
+                f"Email: {email}\n"
+                f"Phone: {phone}\n"
+                f"Date: {date}\n"
+                f"Payment: {record.get('payment_option')}\n"
+                + (f"Location: {record.get('location')}\n" if record.get('location') else "")
+                + (f"Message: {service_details}\n" if service_details else "")
+            )
+            try:
+                queue_email_smtp(owner_email, subject, html, text, reply_to=email)
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+
+def _fs_set_booking(uid: str, booking_id: str, data: Dict[str, Any], op: str) -> bool:
+    try:
+        db = _get_fs_client()
+        if db is not None:
+            db.collection('users').document(uid).collection('bookings').document(booking_id).set(data, merge=True)
+            return True
+    except Exception as ex:
+        logger.warning(f"booking {op}: firestore write failed for {uid}/{booking_id}: {ex}")
+    return False
+
+
+def _persist_submitted_booking(uid: str, record: Dict[str, Any]):
+    booking_id = record["id"]
+    if _fs_set_booking(uid, booking_id, record, "submit"):
+        return
+    # The JSON index only backs list_bookings when Firestore is unavailable
+    try:
+        idx = read_json_key(_user_bookings_index_key(uid)) or {}
+        items = index_items(idx)
+        # store a lightweight copy for listing
+        add_index_item(items, booking_id, {k: record[k] for k in _LITE_KEYS if k in record})
+        idx["items"] = items
+        write_json_key(_user_bookings_index_key(uid), idx)
+    except Exception as ex:
+        logger.warning(f"booking submit: index update failed for {uid}/{booking_id}: {ex}")
+
+
 @router.post("/submit")
-async def submit_booking(
-    form_id: str = Form(...),
-    client_name: str = Form(...),
-    email: str = Form(...),
-    phone: str = Form(...),
-    service_details: str = Form(""),
-    date: str = Form(...),
-    payment_option: str = Form("online"),
-    location: str = Form(""),
-    latitude: Optional[str] = Form(None),
-    longitude: Optional[str] = Form(None),
-):
+async def submit_booking(background_tasks: BackgroundTasks, data: Annotated[BookingSubmit, Form()]):
     try:
         # resolve form -> user
-        reg = read_json_key(_form_registry_key(form_id)) or {}
-        uid = reg.get("user_uid")
+        uid = await asyncio.to_thread(_form_owner, data.form_id)
         if not uid:
             return {"error": "invalid_form"}
 
@@ -830,105 +1027,28 @@ async def submit_booking(
         record: Dict[str, Any] = {
             "id": booking_id,
             "user_uid": uid,
-            "form_id": form_id,
-            "client_name": client_name.strip(),
-            "email": email.strip(),
-            "phone": phone.strip(),
-            "service_details": service_details or "",
-            "date": date,
-            "payment_option": payment_option if payment_option in ("online","offline") else "online",
+            "form_id": data.form_id,
+            "client_name": data.client_name,
+            "email": data.email,
+            "phone": data.phone,
+            "service_details": data.service_details,
+            "date": data.date,
+            "payment_option": data.payment_option if data.payment_option in _PAYMENTS else "online",
             "status": "new",
             "created_at": now,
             "updated_at": now,
         }
-        if location:
-            record["location"] = location.strip()
-        if latitude:
-            record["latitude"] = latitude
-        if longitude:
-            record["longitude"] = longitude
-        write_json_key(_user_booking_record_key(uid, booking_id), record)
-
-        # Firestore persistence (best-effort)
-        try:
-            db = _get_fs_client()
-            if db is not None:
-                db.collection('users').document(uid).collection('bookings').document(booking_id).set(record, merge=True)
-        except Exception as ex:
-            logger.warning(f"booking submit: firestore write failed for {uid}/{booking_id}: {ex}")
-
-        idx = read_json_key(_user_bookings_index_key(uid)) or {"items": []}
-        items = idx.get("items") or []
-        # store a lightweight copy for listing
-        lite_keys = ["id","client_name","email","phone","date","payment_option","status","created_at","updated_at"]
-        try:
-            if record.get("location"):
-                lite_keys.append("location")
-        except Exception:
-            pass
-        lite = {k: record[k] for k in lite_keys if k in record}
-        items.insert(0, lite)
-        idx["items"] = items[:1000]
-        write_json_key(_user_bookings_index_key(uid), idx)
-        # Notify photographer/owner by email (best-effort)
-        try:
-            owner_email = (get_user_email_from_uid(uid) or '').strip()
-            if not owner_email:
-                try:
-                    db = _get_fs_client()
-                    if db is not None:
-                        snap = db.collection('users').document(uid).get()
-                        if getattr(snap, 'exists', False):
-                            data = snap.to_dict() or {}
-                            owner_email = str(data.get('email') or '').strip()
-                except Exception:
-                    pass
-            if owner_email:
-                subject = f"New booking request from {client_name or email}"
-                front = (os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip() or "https://photomark.cloud").rstrip("/")
-                dash_url = f"{front}/#booking"
-                # Simple HTML escaping
-                def esc(s: str) -> str:
-                    try:
-                        return str(s).replace('<', '&lt;').replace('>', '&gt;')
-                    except Exception:
-                        return str(s)
-                intro = (
-                    "A new booking request was submitted via your form.<br><br>"
-                    f"<strong>Name:</strong> {esc(client_name)}<br>"
-                    f"<strong>Email:</strong> <a href='mailto:{email}'>{esc(email)}</a><br>"
-                    f"<strong>Phone:</strong> {esc(phone)}<br>"
-                    f"<strong>Date:</strong> {esc(date)}<br>"
-                    f"<strong>Payment:</strong> {esc(record.get('payment_option'))}<br>"
-                )
-                if record.get('location'):
-                    intro += f"<strong>Location:</strong> {esc(record.get('location'))}<br>"
-                if service_details:
-                    intro += f"<strong>Message:</strong><br>{esc(service_details)}"
-                html = render_email(
-                    "email_basic.html",
-                    title="New booking request",
-                    intro=intro,
-                    button_label="Open Booking",
-                    button_url=dash_url,
-                    footer_note=f"Request ID: {booking_id}",
-                )
-                text = (
-                    "New booking request\n"
-                    f"Name: {client_name}\n"
-                    f"Email: {email}\n"
-                    f"Phone: {phone}\n"
-                    f"Date: {date}\n"
-                    f"Payment: {record.get('payment_option')}\n"
-                    + (f"Location: {record.get('location')}\n" if record.get('location') else "")
-                    + (f"Message: {service_details}\n" if service_details else "")
-                )
-                try:
-                    send_email_smtp(owner_email, subject, html, text, reply_to=email)
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        if data.location:
+            record["location"] = data.location
+        if data.latitude:
+            record["latitude"] = data.latitude
+        if data.longitude:
+            record["longitude"] = data.longitude
+        # The record file is the durable copy; Firestore + index follow after the response
+        await awrite_json_key(_user_booking_record_key(uid, booking_id), record)
+        background_tasks.add_task(_persist_submitted_booking, uid, record)
+        # Notify photographer/owner by email (best-effort, after the response)
+        background_tasks.add_task(_notify_owner, uid, record)
         return {"ok": True, "id": booking_id}
     except Exception as ex:
         logger.exception(f"booking submit failed: {ex}")
@@ -937,100 +1057,199 @@ async def submit_booking(
 
 # --------- Dashboard APIs (auth) ---------
 
+def _fs_list_bookings(
+    uid: str,
+    status: Optional[str],
+    limit: int,
+    start_after: Optional[int],
+    start_after_id: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    db = _get_fs_client()
+    if db is None:
+        return None
+    from firebase_admin import firestore as fb_fs  # type: ignore
+    from google.api_core.exceptions import FailedPrecondition  # type: ignore
+    coll = db.collection('users').document(uid).collection('bookings')
+    # created_at has one-second resolution; the document id breaks ties so pages don't skip
+    doc_id = fb_fs.FieldPath.document_id()
+
+    def _ordered(q):
+        q = q.order_by('created_at', direction=fb_fs.Query.DESCENDING)
+        q = q.order_by(doc_id, direction=fb_fs.Query.DESCENDING)
+        if start_after:
+            if start_after_id:
+                q = q.start_after({'created_at': int(start_after), doc_id: start_after_id})
+            else:
+                # Timestamp-only cursor from older clients: everything strictly older
+                q = q.where('created_at', '<', int(start_after))
+        # Only fetch the fields shown in the listing
+        return q.select(list(_LITE_KEYS))
+
+    if not status:
+        return [d.to_dict() or {} for d in _ordered(coll).limit(limit).stream()]  # type: ignore[attr-defined]
+    try:
+        # Needs the (status, created_at, __name__) composite index from firestore.indexes.json
+        q = _ordered(coll.where('status', '==', status)).limit(limit)
+        return [d.to_dict() or {} for d in q.stream()]  # type: ignore[attr-defined]
+    except FailedPrecondition as ex:
+        # Index not created in this project yet: walk the ordered listing and filter here
+        logger.warning(f"booking list: status index missing for {uid}, filtering in process: {ex}")
+    items: List[Dict[str, Any]] = []
+    for d in _ordered(coll).stream():  # type: ignore[attr-defined]
+        it = d.to_dict() or {}
+        if it.get('status') == status:
+            items.append(it)
+            if len(items) >= limit:
+                break
+    return items
+
+
 @router.get("/list")
-async def list_bookings(request: Request, status: Optional[str] = None):
-    eff_uid, req_uid = resolve_workspace_uid(request)
+async def list_bookings(
+    request: Request,
+    status: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=INDEX_LIMIT),
+    start_after: Optional[int] = None,
+    start_after_id: Optional[str] = None,
+):
+    eff_uid, req_uid = await asyncio.to_thread(resolve_workspace_uid, request)
     if not eff_uid or not req_uid:
         return {"error": "Unauthorized"}
-    if not has_role_access(req_uid, eff_uid, 'gallery'):
+    if not await asyncio.to_thread(has_role_access, req_uid, eff_uid, 'gallery'):
         return {"error": "Forbidden"}
 
+    if status not in _STATUSES:
+        status = None
+
     # Prefer Firestore if available
     try:
-        db = _get_fs_client()
-        if db is not None:
-            q = db.collection('users').document(eff_uid).collection('bookings')
-            docs = [d.to_dict() or {} for d in q.stream()]  # type: ignore[attr-defined]
-            items = []
-            for rec in docs:
-                lite: Dict[str, Any] = {
-                    "id": rec.get("id"),
-                    "client_name": rec.get("client_name"),
-                    "email": rec.get("email"),
-                    "phone": rec.get("phone"),
-                    "date": rec.get("date"),
-                    "payment_option": rec.get("payment_option"),
-                    "status": rec.get("status"),
-                    "created_at": rec.get("created_at"),
-                    "updated_at": rec.get("updated_at"),
-                }
-                # include location if present
-                if rec.get("location"):
-                    lite["location"] = rec.get("location")
-                items.append(lite)
-            # filter and sort by created_at desc
-            if status and status in ("new","pending","confirmed","cancelled"):
-                items = [it for it in items if it.get("status") == status]
-            try:
-                items.sort(key=lambda x: int(x.get("created_at") or 0), reverse=True)
-            except Exception:
-                pass
+        items = await asyncio.to_thread(_fs_list_bookings, eff_uid, status, limit, start_after, start_after_id)
+        if items is not None:
             return {"items": items}
     except Exception as ex:
+        # The index is only maintained when Firestore writes fail, so it is not a
+        # faithful copy to fall back to here
         logger.warning(f"booking list: firestore read failed for {eff_uid}: {ex}")
+        return {"error": "list_failed"}
 
-    # Fallback to JSON index
-    idx = read_json_key(_user_bookings_index_key(eff_uid)) or {"items": []}
-    items = idx.get("items") or []
-    if status and status in ("new","pending","confirmed","cancelled"):
+    # No Firestore client: the JSON index is the listing
+    idx = await aread_json_key(_user_bookings_index_key(eff_uid)) or {}
+    # Newest first, ties broken by id to match the Firestore cursor
+    items = newest_first(index_items(idx))
+    if status:
         items = [it for it in items if it.get("status") == status]
-    return {"items": items}
+    if start_after:
+        if start_after_id:
+            cursor = (int(start_after), start_after_id)
+            items = [it for it in items if listing_key(it) < cursor]
+        else:
+            items = [it for it in items if int(it.get("created_at") or 0) < int(start_after)]
+    return {"items": items[:limit]}
+
+
+def _fs_get_booking(uid: str, booking_id: str) -> Optional[Dict[str, Any]]:
+    db = _get_fs_client()
+    if db is None:
+        return None
+    snap = db.collection('users').document(uid).collection('bookings').document(booking_id).get()
+    if getattr(snap, 'exists', False):
+        return snap.to_dict() or {}
+    return None
 
 
 @router.get("/{booking_id}")
 async def get_booking(request: Request, booking_id: str):
-    eff_uid, req_uid = resolve_workspace_uid(request)
+    eff_uid, req_uid = await asyncio.to_thread(resolve_workspace_uid, request)
     if not eff_uid or not req_uid:
         return {"error": "Unauthorized"}
-    if not has_role_access(req_uid, eff_uid, 'gallery'):
+    if not await asyncio.to_thread(has_role_access, req_uid, eff_uid, 'gallery'):
         return {"error": "Forbidden"}
 
     # Try Firestore first
     try:
-        db = _get_fs_client()
-        if db is not None:
-            snap = db.collection('users').document(eff_uid).collection('bookings').document(booking_id).get()
-            if getattr(snap, 'exists', False):
-                data = snap.to_dict() or {}
-                if data:
-                    return data
+        data = await asyncio.to_thread(_fs_get_booking, eff_uid, booking_id)
+        if data:
+            return data
     except Exception as ex:
         logger.warning(f"booking get: firestore read failed for {eff_uid}/{booking_id}: {ex}")
 
-    rec = read_json_key(_user_booking_record_key(eff_uid, booking_id))
+    rec = await aread_json_key(_user_booking_record_key(eff_uid, booking_id))
     if not rec:
         return {"error": "not_found"}
     return rec
 
 
+def _notify_client_status(uid: str, rec: Dict[str, Any], new_status: str, cancel_reason: str, now: int):
+    try:
+        client_email = (rec.get("email") or "").strip()
+        client_name = (rec.get("client_name") or "").strip()
+        # Resolve account (owner) name for branding in the message
+        owner_email, account_name = _owner_contact(uid)
+        account_name = account_name or "your photographer"
+
+        if client_email:
+            if new_status == "confirmed":
+                subject = "Your booking has been confirmed"
+                intro = (
+                    f"Hi {client_name or 'there'},<br><br>"
+                    f"Good news! Your booking with <b>{account_name}</b> has been <b>confirmed</b>.<br>"
+                    f"If you have any questions, you can reach out directly at <a href='mailto:{owner_email or 'support@photomark.app'}'>{owner_email or 'support@photomark.app'}</a>."
+                )
+            else:
+                subject = "Your booking has been cancelled"
+                parts = [
+                    f"Hi {client_name or 'there'},<br><br>"
+                    f"We’re sorry to let you know your booking with <b>{account_name}</b> was <b>cancelled</b>.<br>"
+                    f"If this was a mistake or you’d like to reschedule, contact us at <a href='mailto:{owner_email or 'support@photomark.app'}'>{owner_email or 'support@photomark.app'}</a>."
+                ]
+                # Append photographer's cancellation reason if provided
+                try:
+                    reason = (cancel_reason or str(rec.get('cancel_reason') or '')).strip()
+                except Exception:
+                    reason = cancel_reason
+                if reason:
+                    parts.append(f"<br><br><strong>Reason:</strong> {_esc(reason)}")
+                intro = "".join(parts)
+
+            html = render_email(
+                "email_basic.html",
+                title=subject,
+                intro=intro,
+                footer_note=f"Status updated at: {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now))} UTC"
+            )
+            # Best-effort: do not block API if email fails
+            try:
+                queue_email_smtp(client_email, subject, html, reply_to=(owner_email or None), from_name=account_name)
+            except Exception:
+                pass
+    except Exception:
+        # Never fail the API due to email issues
+        pass
+
+
 @router.post("/{booking_id}/status")
-async def update_status(request: Request, booking_id: str, payload: Dict[str, Any]):
-    eff_uid, req_uid = resolve_workspace_uid(request)
+async def update_status(request: Request, booking_id: str, payload: Dict[str, Any], background_tasks: BackgroundTasks):
+    eff_uid, req_uid = await asyncio.to_thread(resolve_workspace_uid, request)
     if not eff_uid or not req_uid:
         return {"error": "Unauthorized"}
-    if not has_role_access(req_uid, eff_uid, 'gallery'):
+    if not await asyncio.to_thread(has_role_access, req_uid, eff_uid, 'gallery'):
         return {"error": "Forbidden"}
 
     rec_key = _user_booking_record_key(eff_uid, booking_id)
-    rec = read_json_key(rec_key)
+    rec = await aread_json_key(rec_key)
     if not rec:
         return {"error": "not_found"}
 
     new_status = str(payload.get("status") or "").lower()
     # Optional cancellation reason provided by the photographer when cancelling
     cancel_reason = str(payload.get("cancel_reason") or payload.get("reason") or payload.get("comment") or "").strip()
-    if new_status not in ("new","pending","confirmed","cancelled"):
+    if new_status not in _STATUSES:
         return {"error": "bad_status"}
+    # Idempotent retries (same status, no new cancellation reason) skip every write and email
+    if rec.get("status") == new_status and (
+        new_status != "cancelled" or not cancel_reason or cancel_reason == rec.get("cancel_reason")
+    ):
+        return {"ok": True, "status": new_status, "noop": True}
 
     now = int(time.time())
     rec["status"] = new_status
@@ -1038,91 +1257,30 @@ async def update_status(request: Request, booking_id: str, payload: Dict[str, An
     # Persist cancellation reason on the record if provided
     if new_status == "cancelled" and cancel_reason:
         rec["cancel_reason"] = cancel_reason
-    write_json_key(rec_key, rec)
-
-    # Firestore update (best-effort)
-    try:
-        db = _get_fs_client()
-        if db is not None:
-            db.collection('users').document(eff_uid).collection('bookings').document(booking_id).set({
-                "status": new_status,
-                "updated_at": now,
-                **({"cancel_reason": cancel_reason} if (new_status == "cancelled" and cancel_reason) else {}),
-            }, merge=True)
-    except Exception as ex:
-        logger.warning(f"booking status: firestore update failed for {eff_uid}/{booking_id}: {ex}")
+    fs_patch = {
+        "status": new_status,
+        "updated_at": now,
+        **({"cancel_reason": cancel_reason} if (new_status == "cancelled" and cancel_reason) else {}),
+    }
+    # Record file and Firestore update (best-effort) are independent; write them concurrently
+    _, fs_ok = await asyncio.gather(
+        awrite_json_key(rec_key, rec),
+        asyncio.to_thread(_fs_set_booking, eff_uid, booking_id, fs_patch, "status"),
+    )
 
-    # update index
-    idx = read_json_key(_user_bookings_index_key(eff_uid)) or {"items": []}
-    items: List[Dict[str, Any]] = idx.get("items") or []
-    for it in items:
-        if it.get("id") == booking_id:
+    # update index (only the fallback listing source when Firestore is unavailable)
+    if not fs_ok:
+        idx = await aread_json_key(_user_bookings_index_key(eff_uid)) or {}
+        items = index_items(idx)
+        it = items.get(booking_id)
+        if it is not None:
             it["status"] = new_status
             it["updated_at"] = now
-            break
-    idx["items"] = items
-    write_json_key(_user_bookings_index_key(eff_uid), idx)
+            idx["items"] = items
+            await awrite_json_key(_user_bookings_index_key(eff_uid), idx)
 
-    # Notify client by email for important status changes
-    try:
-        if new_status in ("confirmed", "cancelled"):
-            client_email = (rec.get("email") or "").strip()
-            client_name = (rec.get("client_name") or "").strip()
-            # Resolve account (owner) name for branding in the message
-            account_name = "your photographer"
-            owner_email = ""
-            try:
-                db = _get_fs_client()
-                if db is not None:
-                    snap = db.collection('users').document(eff_uid).get()
-                    if getattr(snap, 'exists', False):
-                        data = snap.to_dict() or {}
-                        account_name = str(data.get('name') or account_name)
-                        owner_email = str(data.get('email') or owner_email)
-            except Exception:
-                pass
-
-            if client_email:
-                if new_status == "confirmed":
-                    subject = "Your booking has been confirmed"
-                    intro = (
-                        f"Hi {client_name or 'there'},<br><br>"
-                        f"Good news! Your booking with <b>{account_name}</b> has been <b>confirmed</b>.<br>"
-                        f"If you have any questions, you can reach out directly at <a href='mailto:{owner_email or 'support@photomark.app'}'>{owner_email or 'support@photomark.app'}</a>."
-                    )
-                else:
-                    subject = "Your booking has been cancelled"
-                    intro = (
-                        f"Hi {client_name or 'there'},<br><br>"
-                        f"We’re sorry to let you know your booking with <b>{account_name}</b> was <b>cancelled</b>.<br>"
-                        f"If this was a mistake or you’d like to reschedule, contact us at <a href='mailto:{owner_email or 'support@photomark.app'}'>{owner_email or 'support@photomark.app'}</a>."
-                    )
-                    # Append photographer's cancellation reason if provided
-                    try:
-                        reason = (cancel_reason or str(rec.get('cancel_reason') or '')).strip()
-                    except Exception:
-                        reason = cancel_reason
-                    if reason:
-                        def esc(s: str) -> str:
-                            try:
-                                return str(s).replace('<', '&lt;').replace('>', '&gt;')
-                            except Exception:
-                                return str(s)
-                        intro += f"<br><br><strong>Reason:</strong> {esc(reason)}"
-
-                html = render_email(
-                    "email_basic.html",
-                    title=subject,
-                    intro=intro,
-                    footer_note=f"Status updated at: {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now))} UTC"
-                )
-                # Best-effort: do not block API if email fails
-                try:
-                    send_email_smtp(client_email, subject, html, reply_to=(owner_email or None), from_name=account_name)
-                except Exception:
-                    pass
-    except Exception:
-        # Never fail the API due to email issues
-        pass
+    # Notify client by email for important status changes (after the response)
+    if new_status in ("confirmed", "cancelled"):
+        background_tasks.add_task(_notify_client_status, eff_uid, rec, new_status, cancel_reason, now)
 
     return {"ok": True, "status": new_status}
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, FastAPI, Query, HTTPException
+from contextlib import asynccontextmanager
 import httpx
 from typing import Optional
 
@@ -6,12 +7,47 @@ from app.core.config import (
     RAPIDAPI_CAMERA_DB_KEY,
     logger,
 )
+from app.utils.ttl_cache import TTLCache
 
 # Correct RapidAPI base and host values
 RAPIDAPI_CAMERA_DB_BASE = "https://camera-database.p.rapidapi.com"
 RAPIDAPI_CAMERA_DB_HOST = "camera-database.p.rapidapi.com"
 
-router = APIRouter(prefix="/api/camera-db", tags=["camera-db"])
+# Shared client so keep-alive connections to RapidAPI are reused across requests. It is
+# opened and closed by the router lifespan (merged into the app's on include_router), so
+# it lives on the server's event loop and its sockets are released on shutdown.
+_client: Optional[httpx.AsyncClient] = None
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    global _client
+    _client = httpx.AsyncClient(
+        timeout=20.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+    )
+    try:
+        yield
+    finally:
+        client, _client = _client, None
+        await client.aclose()
+
+
+router = APIRouter(prefix="/api/camera-db", tags=["camera-db"], lifespan=_lifespan)
+
+
+def _get_client() -> httpx.AsyncClient:
+    if _client is None:
+        raise HTTPException(status_code=503, detail={"message": "Camera DB client not started"})
+    return _client
+
+
+# Brand/mount listings are effectively static; cache parsed upstream JSON to save RapidAPI quota
+_RESP_CACHE = TTLCache(maxsize=1024, ttl=3600)
+
+
+def _cache_key(endpoint: str, params: dict) -> tuple:
+    return (endpoint, tuple(sorted(params.items())))
 
 
 def _headers():
@@ -44,29 +80,36 @@ async def list_lenses(
     if mount:
         params["mount"] = mount
 
+    cache_key = _cache_key("lenses", params)
+    cached = _RESP_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     url = f"{RAPIDAPI_CAMERA_DB_BASE}/lenses"
     logger.info("Upstream request -> %s params=%s headers=%s", url, params, _headers())
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
+    client = _get_client()
+    try:
+        r = await client.get(url, headers=_headers(), params=params)
+        r.raise_for_status()
+        data = r.json()
+        _RESP_CACHE.put(cache_key, data)
+        return data
+    except httpx.HTTPStatusError as ex:
+        status = ex.response.status_code
         try:
-            r = await client.get(url, headers=_headers(), params=params)
-            r.raise_for_status()
-            return r.json()
-        except httpx.HTTPStatusError as ex:
-            status = ex.response.status_code
-            try:
-                detail = ex.response.json()
-            except Exception:
-                detail = ex.response.text
-            logger.error("Camera DB upstream error: %s %s", status, detail)
-            raise HTTPException(status_code=502, detail={
-                "upstream_status": status,
-                "message": "Camera DB upstream error",
-                "detail": detail
-            })
-        except Exception as ex:
-            logger.error("Camera DB request failed: %s", ex)
-            raise HTTPException(status_code=502, detail={"message": "Camera DB request failed", "error": str(ex)})
+            detail = ex.response.json()
+        except Exception:
+            detail = ex.response.text
+        logger.error("Camera DB upstream error: %s %s", status, detail)
+        raise HTTPException(status_code=502, detail={
+            "upstream_status": status,
+            "message": "Camera DB upstream error",
+            "detail": detail
+        })
+    except Exception as ex:
+        logger.error("Camera DB request failed: %s", ex)
+        raise HTTPException(status_code=502, detail={"message": "Camera DB request failed", "error": str(ex)})
 
 
 @router.get("/cameras")
@@ -85,29 +128,36 @@ async def list_cameras(
     if mount:
         params["mount"] = mount
 
+    cache_key = _cache_key("cameras", params)
+    cached = _RESP_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
     url = f"{RAPIDAPI_CAMERA_DB_BASE}/cameras"
     logger.info("Upstream request -> %s params=%s headers=%s", url, params, _headers())
 
-    async with httpx.AsyncClient(timeout=20.0) as client:
+    client = _get_client()
+    try:
+        r = await client.get(url, headers=_headers(), params=params)
+        r.raise_for_status()
+        data = r.json()
+        _RESP_CACHE.put(cache_key, data)
+        return data
+    except httpx.HTTPStatusError as ex:
+        status = ex.response.status_code
         try:
-            r = await client.get(url, headers=_headers(), params=params)
-            r.raise_for_status()
-            return r.json()
-        except httpx.HTTPStatusError as ex:
-            status = ex.response.status_code
-            try:
-                detail = ex.response.json()
-            except Exception:
-                detail = ex.response.text
-            logger.error("Camera DB upstream error: %s %s", status, detail)
-            raise HTTPException(status_code=502, detail={
-                "upstream_status": status,
-                "message": "Camera DB upstream error",
-                "detail": detail
-            })
-        except Exception as ex:
-            logger.error("Camera DB request failed: %s", ex)
-            raise HTTPException(status_code=502, detail={"message": "Camera DB request failed", "error": str(ex)})
+            detail = ex.response.json()
+        except Exception:
+            detail = ex.response.text
+        logger.error("Camera DB upstream error: %s %s", status, detail)
+        raise HTTPException(status_code=502, detail={
+            "upstream_status": status,
+            "message": "Camera DB upstream error",
+            "detail": detail
+        })
+    except Exception as ex:
+        logger.error("Camera DB request failed: %s", ex)
+        raise HTTPException(status_code=502, detail={"message": "Camera DB request failed", "error": str(ex)})
 
 
 
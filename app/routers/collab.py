@@ -3,6 +3,8 @@ from typing import Optional, List, Dict, Any, Tuple
 import io
 import os
 import json
+import re
+import asyncio
 from datetime import datetime as _dt
 
 import numpy as np
@@ -19,7 +21,7 @@ from app.core.config import (
     COLLAB_MAX_RECIPIENTS,
 )
 from app.core.auth import get_uid_from_request, get_uid_by_email, get_user_email_from_uid, get_fs_client as _get_fs_client
-from app.utils.emailing import render_email, send_email_smtp
+from app.utils.emailing import render_email, queue_email_smtp
 from app.utils.storage import upload_bytes, read_json_key, write_json_key, read_bytes_key
 
 # Firestore admin helpers (for server timestamps)
@@ -30,6 +32,9 @@ except Exception:
 
 router = APIRouter(prefix="/api/collab", tags=["collab"]) 
 
+# Frontend base for links in notification emails; the env does not change at runtime
+_FRONT_ORIGIN = os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip().rstrip("/")
+
 # ----------------------
 # Helpers
 # ----------------------
@@ -38,6 +43,22 @@ def _normalize_email(e: str) -> str:
     return (e or "").strip().lower()
 
 
+_EMAIL_SPLIT_RE = re.compile(r"[\s,;]+")
+
+
+def _parse_emails(raw: Optional[str]) -> List[str]:
+    """Split a recipient list on commas/semicolons/whitespace; normalized, deduped, order kept.
+
+    Malformed entries are kept so they can be reported back; see _valid_email.
+    """
+    return list(dict.fromkeys(e for e in _EMAIL_SPLIT_RE.split((raw or "").lower()) if e))
+
+
+def _valid_email(e: str) -> bool:
+    # Entries without an "@" can never resolve to an account; skip the user lookup
+    return "@" in e
+
+
 def _friendly_err(msg: str, code: int = status.HTTP_400_BAD_REQUEST):
     raise HTTPException(status_code=code, detail={"error": msg})
 
@@ -49,6 +70,9 @@ def _rate_key(uid: str) -> str:
 def _recent_key(uid: str) -> str:
     return f"users/{uid}/collab/recent_recipients.json"
 
+# Max recipients processed at once when fanning out a send (storage/lookups run in threads)
+_FANOUT_CONCURRENCY = 8
+
 # Special vault to categorize collaboration uploads in the gallery
 FRIENDS_VAULT_NAME = "Photos sent by friends"
 
@@ -120,12 +144,9 @@ def _record_recent(uid: str, emails: List[str]):
     if not emails:
         return
     rec = read_json_key(_recent_key(uid)) or {"emails": []}
-    cur = [str(x).lower().strip() for x in (rec.get("emails") or []) if str(x).strip()]
-    for e in emails:
-        if e in cur:
-            cur.remove(e)
-        cur.insert(0, e)
-    cur = cur[:50]
+    # Callers pass _normalize_email'd addresses and this is the only writer, so stored
+    # entries are already normalized; the latest send moves an address to the front
+    cur = list(dict.fromkeys([*reversed(emails), *(rec.get("emails") or [])]))[:50]
     write_json_key(_recent_key(uid), {"emails": cur, "updated_at": _dt.utcnow().isoformat()})
 
 
@@ -140,6 +161,8 @@ def _validate_upload(filename: str, size: int):
     ext = os.path.splitext(filename)[1] or ""
     if not _ext_ok(ext):
         _friendly_err(f"Unsupported format {ext or '(none)'}")
+    # Starlette counts UploadFile.size server-side while spooling the part, so this is
+    # the real byte count and a single file.read() afterwards stays within the limit
     max_bytes = COLLAB_MAX_IMAGE_MB * 1024 * 1024
     if size > max_bytes:
         _friendly_err(f"File too large. Limit is {COLLAB_MAX_IMAGE_MB} MB.")
@@ -293,8 +316,55 @@ CT_MAP = {
 }
 
 
+_JPEG_MAGIC = b"\xff\xd8\xff"
+# Larger JPEGs are re-encoded rather than served to galleries as uploaded
+_JPEG_PASSTHROUGH_MAX_BYTES = 8 * 1024 * 1024
+# APP1 (EXIF incl. GPS, XMP) and APP13 (IPTC) carry metadata a re-encode would drop too
+_JPEG_METADATA_MARKERS = frozenset((0xE1, 0xED))
+
+
+def _strip_jpeg_metadata(raw: bytes) -> Optional[bytes]:
+    """Copy a JPEG without its APP1/APP13 segments; None if the header is malformed."""
+    out = bytearray(raw[:2])
+    i, n = 2, len(raw)
+    while i + 4 <= n:
+        if raw[i] != 0xFF:
+            return None
+        marker = raw[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker == 0xDA:  # start of scan: entropy-coded data follows unchanged
+            out += raw[i:]
+            return bytes(out)
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # no length field
+            out += raw[i:i + 2]
+            i += 2
+            continue
+        end = i + 2 + int.from_bytes(raw[i + 2:i + 4], "big")
+        if end > n:
+            return None
+        if marker not in _JPEG_METADATA_MARKERS:
+            out += raw[i:end]
+        i = end
+    return None
+
+
 def _reencode_to_jpeg(raw: bytes) -> bytes:
-    img = Image.open(io.BytesIO(raw)).convert('RGB')
+    img = Image.open(io.BytesIO(raw))
+    # Browser-ready JPEGs are already a valid gallery asset; Image.open only parsed the
+    # header, so this skips the full decode + re-encode. Metadata is still stripped so
+    # the shared copy never carries the sender's location.
+    if (
+        raw[:3] == _JPEG_MAGIC
+        and img.format == "JPEG"
+        and img.mode in ("RGB", "L")
+        and len(raw) <= _JPEG_PASSTHROUGH_MAX_BYTES
+    ):
+        stripped = _strip_jpeg_metadata(raw)
+        if stripped is not None:
+            return stripped
+    img = img.convert('RGB')
     buf = io.BytesIO()
     img.save(buf, format='JPEG', quality=95, subsampling=0, progressive=True, optimize=True)
     return buf.getvalue()
@@ -324,11 +394,7 @@ async def send_to_friends(
 
     _incr_rate(sender_uid)
 
-    emails = [
-        _normalize_email(e)
-        for e in (friend_emails or "").split(",")
-        if _normalize_email(e)
-    ]
+    emails = _parse_emails(friend_emails)
     if not emails:
         _friendly_err("At least one recipient is required")
     if len(emails) > COLLAB_MAX_RECIPIENTS:
@@ -345,9 +411,6 @@ async def send_to_friends(
         _friendly_err(f"Unsupported format {orig_ext}")
     orig_ct = CT_MAP.get(orig_ext, 'application/octet-stream')
 
-    # Re-encode once for gallery JPEG
-    gallery_jpeg = _reencode_to_jpeg(raw)
-
     # Annotations removed: do not burn any annotations; keep gallery JPEG as re-encoded original
     # Note is stored only in metadata below and not rendered onto pixels.
 
@@ -355,69 +418,96 @@ async def send_to_friends(
     base = os.path.splitext(os.path.basename(fname))[0][:100] or 'image'
     stamp = int(_dt.utcnow().timestamp())
 
-    results: List[Dict[str, Any]] = []
-
-    for email in emails:
+    # Re-encode once for the gallery JPEG alongside the sender lookup; an undecodable
+    # upload fails the request here, before any per-recipient work starts
+    gallery_jpeg, sender_email = await asyncio.gather(
+        asyncio.to_thread(_reencode_to_jpeg, raw),
+        asyncio.to_thread(get_user_email_from_uid, sender_uid),
+        return_exceptions=True,
+    )
+    if isinstance(sender_email, BaseException):
+        raise sender_email
+    if isinstance(gallery_jpeg, BaseException):
+        logger.warning(f"send_to_friends: could not decode {fname}: {gallery_jpeg}")
+        _friendly_err("Could not process image")
+
+    # Sender identity and the notification body are the same for every recipient
+    html = render_email(
+        "email_basic.html",
+        title="You received a photo",
+        intro=f"<p>You received a photo from <b>{sender_email or 'a friend'}</b> to your gallery.</p>" + (f"<p>Note: {note}</p>" if note else ""),
+        button_url=_FRONT_ORIGIN + "#gallery",
+        button_label="Open your gallery",
+        footer_note="If you weren't expecting this, you can ignore this message.",
+    )
+
+    sem = asyncio.Semaphore(_FANOUT_CONCURRENCY)
+    vault_locks: Dict[str, asyncio.Lock] = {}
+
+    def _write_meta(key: str):
+        # Store meta envelope (note/annotations are already burned-in; we still keep lightweight meta for traceability)
         try:
-            friend_uid = get_uid_by_email(email)
-            if not friend_uid:
-                results.append({"email": email, "ok": False, "error": "Friend not found"})
-                continue
+            meta_key = f"{os.path.splitext(key)[0]}.json"
+            meta: Dict[str, Any] = read_json_key(meta_key) or {}
+            if not isinstance(meta, dict):
+                meta = {}
+            meta.setdefault("from", sender_email or None)
+            meta["at"] = _dt.utcnow().isoformat()
+            if note and str(note).strip():
+                meta["note"] = str(note).strip()
+            write_json_key(meta_key, meta)
+        except Exception as ex:
+            logger.warning(f"collab: failed to write meta json for {key}: {ex}")
 
-            original_key = f"users/{friend_uid}/originals/{date_prefix}/{base}-{stamp}-fromfriend-orig{orig_ext}"
-            original_url = upload_bytes(original_key, raw, content_type=orig_ct)
+    async def _deliver_one(email: str) -> Dict[str, Any]:
+        # Recipients are independent: storage and lookups for each run in worker threads
+        if not _valid_email(email):
+            return {"email": email, "ok": False, "error": "Invalid email"}
+        async with sem:
+            try:
+                friend_uid = await asyncio.to_thread(get_uid_by_email, email)
+                if not friend_uid:
+                    return {"email": email, "ok": False, "error": "Friend not found"}
+
+                original_key = f"users/{friend_uid}/originals/{date_prefix}/{base}-{stamp}-fromfriend-orig{orig_ext}"
+                oext_token = (orig_ext.lstrip('.') or 'jpg').lower()
+                key = f"users/{friend_uid}/partners/{date_prefix}/{base}-{stamp}-fromfriend-o{oext_token}.jpg"
+
+                # The two PUTs are independent
+                original_url, url = await asyncio.gather(
+                    asyncio.to_thread(upload_bytes, original_key, raw, content_type=orig_ct),
+                    asyncio.to_thread(upload_bytes, key, gallery_jpeg, content_type='image/jpeg'),
+                )
 
-            oext_token = (orig_ext.lstrip('.') or 'jpg').lower()
-            key = f"users/{friend_uid}/partners/{date_prefix}/{base}-{stamp}-fromfriend-o{oext_token}.jpg"
-            url = upload_bytes(key, gallery_jpeg, content_type='image/jpeg')
+                await asyncio.to_thread(_write_meta, key)
 
-            # Store meta envelope (note/annotations are already burned-in; we still keep lightweight meta for traceability)
-            try:
-                meta_key = f"{os.path.splitext(key)[0]}.json"
-                meta: Dict[str, Any] = read_json_key(meta_key) or {}
-                if not isinstance(meta, dict):
-                    meta = {}
-                meta.setdefault("from", get_user_email_from_uid(sender_uid) or None)
-                meta["at"] = _dt.utcnow().isoformat()
-                if note and str(note).strip():
-                    meta["note"] = str(note).strip()
-                write_json_key(meta_key, meta)
-            except Exception as ex:
-                logger.warning(f"collab: failed to write meta json for {key}: {ex}")
+                try:
+                    queue_email_smtp(email, "New photo received", html)
+                except Exception as ex:
+                    logger.warning(f"Email notify failed for {email}: {ex}")
 
-            try:
-                sender_email = get_user_email_from_uid(sender_uid) or "a friend"
-                gallery_link = os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip().rstrip("/") + "#gallery"
-                html = render_email(
-                    "email_basic.html",
-                    title="You received a photo",
-                    intro=f"<p>You received a photo from <b>{sender_email}</b> to your gallery.</p>" + (f"<p>Note: {note}</p>" if note else ""),
-                    button_url=gallery_link,
-                    button_label="Open your gallery",
-                    footer_note="If you weren't expecting this, you can ignore this message.",
-                )
-                send_email_smtp(email, "New photo received", html)
-            except Exception as ex:
-                logger.warning(f"Email notify failed for {email}: {ex}")
+                try:
+                    # The vault json is read-modify-write; serialize recipients that resolve to the same user
+                    async with vault_locks.setdefault(friend_uid, asyncio.Lock()):
+                        await asyncio.to_thread(_add_to_vault, friend_uid, FRIENDS_VAULT_NAME, [key])
+                except Exception as ex:
+                    logger.warning(f"collab: failed to add to friends vault for {email}: {ex}")
 
-            try:
-                _add_to_vault(friend_uid, FRIENDS_VAULT_NAME, [key])
+                return {
+                    "email": email,
+                    "ok": True,
+                    "key": key,
+                    "url": url,
+                    "original_key": original_key,
+                    "original_url": original_url
+                }
             except Exception as ex:
-                logger.warning(f"collab: failed to add to friends vault for {email}: {ex}")
+                logger.exception(f"send_to_friends error for {email}: {ex}")
+                return {"email": email, "ok": False, "error": "Internal error"}
 
-            results.append({
-                "email": email,
-                "ok": True,
-                "key": key,
-                "url": url,
-                "original_key": original_key,
-                "original_url": original_url
-            })
-        except Exception as ex:
-            logger.exception(f"send_to_friends error for {email}: {ex}")
-            results.append({"email": email, "ok": False, "error": "Internal error"})
+    results: List[Dict[str, Any]] = list(await asyncio.gather(*(_deliver_one(e) for e in emails)))
 
-    _record_recent(sender_uid, emails)
+    _record_recent(sender_uid, [e for e in emails if _valid_email(e)])
 
     return {"ok": True, "results": results}
 
@@ -466,6 +556,7 @@ async def send_multiple_to_friend(
         per_item_notes.append(s)
 
     date_prefix = _dt.utcnow().strftime('%Y/%m/%d')
+    sender_email = get_user_email_from_uid(sender_uid)
 
     items: List[Dict[str, Any]] = []
     for idx, f in enumerate(files):
@@ -483,8 +574,8 @@ async def send_multiple_to_friend(
                 continue
             orig_ct = CT_MAP.get(orig_ext, 'application/octet-stream')
 
-            # Prepare gallery jpeg
-            gallery_jpeg = _reencode_to_jpeg(raw)
+            # Prepare gallery jpeg (CPU-bound; keep it off the event loop)
+            gallery_jpeg = await asyncio.to_thread(_reencode_to_jpeg, raw)
 
             # No annotations: do not modify pixels; notes are stored in metadata only
             n = per_item_notes[idx] if idx < len(per_item_notes) else None
@@ -492,20 +583,20 @@ async def send_multiple_to_friend(
             base = os.path.splitext(os.path.basename(fname))[0][:100] or 'image'
             stamp = int(_dt.utcnow().timestamp())
 
-            # Save ORIGINAL
+            # Save ORIGINAL and GALLERY JPEG (possibly annotated) concurrently
             original_key = f"users/{friend_uid}/originals/{date_prefix}/{base}-{stamp}-fromfriend-orig{orig_ext}"
-            original_url = upload_bytes(original_key, raw, content_type=orig_ct)
-
-            # Save GALLERY JPEG (possibly annotated)
             oext_token = (orig_ext.lstrip('.') or 'jpg').lower()
             key = f"users/{friend_uid}/partners/{date_prefix}/{base}-{stamp}-fromfriend-o{oext_token}.jpg"
-            url = upload_bytes(key, gallery_jpeg, content_type='image/jpeg')
+            original_url, url = await asyncio.gather(
+                asyncio.to_thread(upload_bytes, original_key, raw, content_type=orig_ct),
+                asyncio.to_thread(upload_bytes, key, gallery_jpeg, content_type='image/jpeg'),
+            )
 
             # Lightweight meta
             try:
                 meta_key = f"{os.path.splitext(key)[0]}.json"
                 meta: Dict[str, Any] = {
-                    "from": get_user_email_from_uid(sender_uid) or None,
+                    "from": sender_email or None,
                     "at": _dt.utcnow().isoformat(),
                 }
                 if n and str(n).strip():
@@ -525,30 +616,32 @@ async def send_multiple_to_friend(
                 "note": n,
                 "annotations_burned": False,
             })
-
-            try:
-                _add_to_vault(friend_uid, FRIENDS_VAULT_NAME, [key])
-            except Exception as ex:
-                logger.warning(f"collab: failed to record multi item {idx} in friends vault: {ex}")
         except Exception as ex:
             logger.exception(f"send-multiple-to-friend error for index {idx}: {ex}")
             items.append({"index": idx, "ok": False, "error": "Internal error"})
 
+    # Record all delivered items in the friends vault with a single read-modify-write
+    vault_keys = [it["key"] for it in items if it.get("ok")]
+    if vault_keys:
+        try:
+            _add_to_vault(friend_uid, FRIENDS_VAULT_NAME, vault_keys)
+        except Exception as ex:
+            logger.warning(f"collab: failed to record multi items in friends vault: {ex}")
+
     # Email once
     try:
-        sender_email = get_user_email_from_uid(sender_uid) or "a friend"
-        gallery_link = os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip().rstrip("/") + "#gallery"
+        gallery_link = _FRONT_ORIGIN + "#gallery"
         ok_count = len([x for x in items if x.get('ok')])
         noun = "photo" if ok_count == 1 else "photos"
         html = render_email(
             "email_basic.html",
             title=("You received a photo" if ok_count == 1 else "You received photos"),
-            intro=f"<p>You received {ok_count} {noun} from <b>{sender_email}</b> to your gallery.</p>",
+            intro=f"<p>You received {ok_count} {noun} from <b>{sender_email or 'a friend'}</b> to your gallery.</p>",
             button_url=gallery_link,
             button_label="Open your gallery",
             footer_note="If you weren't expecting this, you can ignore this message.",
         )
-        send_email_smtp(email, ("New photo received" if ok_count == 1 else "New photos received"), html)
+        queue_email_smtp(email, ("New photo received" if ok_count == 1 else "New photos received"), html)
     except Exception as ex:
         logger.warning(f"Email notify failed (send-multiple-to-friend): {ex}")
 
@@ -593,11 +686,7 @@ async def send_existing(
 
     _incr_rate(uid)
 
-    emails = [
-        _normalize_email(e)
-        for e in (friend_emails or "").split(",")
-        if _normalize_email(e)
-    ]
+    emails = _parse_emails(friend_emails)
     if not emails:
         _friendly_err("At least one recipient is required")
     if len(emails) > COLLAB_MAX_RECIPIENTS:
@@ -609,103 +698,123 @@ async def send_existing(
         _friendly_err("Invalid keys payload")
     if not isinstance(src_keys, list) or not src_keys:
         _friendly_err("No items selected")
+    if not all(isinstance(k, str) for k in src_keys):
+        _friendly_err("Invalid keys payload")
 
     # Annotations removed: copies are sent as-is; optional note stored in metadata only
 
-    results: List[Dict[str, Any]] = []
+    sender_email = await asyncio.to_thread(get_user_email_from_uid, uid)
 
-    for email in emails:
-        friend_uid = get_uid_by_email(email)
-        if not friend_uid:
-            results.append({"email": email, "ok": False, "error": "Friend not found"})
-            continue
+    # Everything below depends only on the request or the source key, not the recipient
+    date_prefix = _dt.utcnow().strftime('%Y/%m/%d')
+    stamp = int(_dt.utcnow().timestamp())
+    note_text = str(note).strip() if note else ""
+    sources: Dict[str, Tuple[str, str, str]] = {}
+    for k in src_keys:
+        base_name = os.path.basename(k)
+        orig_token = "jpg"
+        if "-o" in base_name:
+            orig_token = base_name.split("-o")[-1].split(".")[0].lower() or "jpg"
+        name = os.path.splitext(base_name)[0]
+        # Try to copy original too
+        candidate_orig = k.replace('/watermarked/', '/originals/').rsplit('-o', 1)[0]
+        sources[k] = (name, orig_token, f"{candidate_orig}-orig.{orig_token}")
+
+    sem = asyncio.Semaphore(_FANOUT_CONCURRENCY)
+    vault_locks: Dict[str, asyncio.Lock] = {}
+
+    def _copy_one(friend_uid: str, k: str) -> Dict[str, Any]:
+        data = read_bytes_key(k)
+        if not data:
+            return {"key": k, "ok": False, "error": "Not found"}
 
-        per_email = {"email": email, "ok": True, "items": []}
+        # No annotations: send copy as-is
+        to_send = data
+        name, orig_token, candidate_orig = sources[k]
 
-        for k in src_keys:
-            try:
-                data = read_bytes_key(k)
-                if not data:
-                    per_email["items"].append({"key": k, "ok": False, "error": "Not found"})
-                    continue
-
-                # No annotations: send copy as-is
-                to_send = data
-
-                base_name = os.path.basename(k)
-                orig_token = "jpg"
-                if "-o" in base_name:
-                    orig_token = base_name.split("-o")[-1].split(".")[0].lower() or "jpg"
-                date_prefix = _dt.utcnow().strftime('%Y/%m/%d')
-                name = os.path.splitext(base_name)[0]
-                stamp = int(_dt.utcnow().timestamp())
-
-                dest_key = f"users/{friend_uid}/partners/{date_prefix}/{name}-{stamp}-fromfriend.jpg"
-                dest_url = upload_bytes(dest_key, to_send, content_type='image/jpeg')
-                # Persist note metadata for recipient if provided
+        dest_key = f"users/{friend_uid}/partners/{date_prefix}/{name}-{stamp}-fromfriend.jpg"
+        dest_url = upload_bytes(dest_key, to_send, content_type='image/jpeg')
+        # Persist note metadata for recipient if provided
+        try:
+            if note_text:
+                meta_key = f"{os.path.splitext(dest_key)[0]}.json"
+                meta = {
+                    "from": sender_email or None,
+                    "at": _dt.utcnow().isoformat(),
+                    "note": note_text,
+                }
+                write_json_key(meta_key, meta)
+        except Exception as ex:
+            logger.warning(f"collab: failed to write note meta for {dest_key}: {ex}")
+
+        orig_bytes = read_bytes_key(candidate_orig) or data
+        orig_ct = CT_MAP.get(f".{orig_token}", 'application/octet-stream')
+        dest_orig_key = f"users/{friend_uid}/originals/{date_prefix}/{name}-{stamp}-fromfriend-orig.{orig_token}"
+        dest_orig_url = upload_bytes(dest_orig_key, orig_bytes, content_type=orig_ct)
+
+        return {
+            "key": k,
+            "ok": True,
+            "dest_key": dest_key,
+            "dest_url": dest_url,
+            "dest_original_key": dest_orig_key,
+            "dest_original_url": dest_orig_url,
+        }
+
+    async def _deliver_one(email: str) -> Dict[str, Any]:
+        # Recipients are independent: copy for each one concurrently in worker threads
+        if not _valid_email(email):
+            return {"email": email, "ok": False, "error": "Invalid email"}
+        async with sem:
+            friend_uid = await asyncio.to_thread(get_uid_by_email, email)
+            if not friend_uid:
+                return {"email": email, "ok": False, "error": "Friend not found"}
+
+            per_email = {"email": email, "ok": True, "items": []}
+
+            for k in src_keys:
                 try:
-                    if note and str(note).strip():
-                        meta_key = f"{os.path.splitext(dest_key)[0]}.json"
-                        meta = {
-                            "from": get_user_email_from_uid(uid) or None,
-                            "at": _dt.utcnow().isoformat(),
-                            "note": str(note).strip(),
-                        }
-                        write_json_key(meta_key, meta)
+                    per_email["items"].append(await asyncio.to_thread(_copy_one, friend_uid, k))
                 except Exception as ex:
-                    logger.warning(f"collab: failed to write note meta for {dest_key}: {ex}")
-
-                # Try to copy original too
-                candidate_orig = k.replace('/watermarked/', '/originals/').rsplit('-o', 1)[0]
-                candidate_orig = f"{candidate_orig}-orig.{orig_token}"
-                orig_bytes = read_bytes_key(candidate_orig) or data
-                orig_ct = {
-                    'jpg': 'image/jpeg', 'jpeg': 'image/jpeg', 'png': 'image/png', 'webp': 'image/webp', 'heic': 'image/heic', 'tif': 'image/tiff', 'tiff': 'image/tiff'
-                }.get(orig_token, 'application/octet-stream')
-                dest_orig_key = f"users/{friend_uid}/originals/{date_prefix}/{name}-{stamp}-fromfriend-orig.{orig_token}"
-                dest_orig_url = upload_bytes(dest_orig_key, orig_bytes, content_type=orig_ct)
-
-                per_email["items"].append({
-                    "key": k,
-                    "ok": True,
-                    "dest_key": dest_key,
-                    "dest_url": dest_url,
-                    "dest_original_key": dest_orig_key,
-                    "dest_original_url": dest_orig_url,
-                })
+                    logger.warning(f"send-existing failed for {k}: {ex}")
+                    per_email["items"].append({"key": k, "ok": False, "error": "Internal error"})
 
+            # One vault read-modify-write per recipient instead of one per copied key
+            dest_keys = [it["dest_key"] for it in per_email["items"] if it.get("ok")]
+            if dest_keys:
                 try:
-                    _add_to_vault(friend_uid, FRIENDS_VAULT_NAME, [dest_key])
+                    # Serialize recipients that resolve to the same user
+                    async with vault_locks.setdefault(friend_uid, asyncio.Lock()):
+                        await asyncio.to_thread(_add_to_vault, friend_uid, FRIENDS_VAULT_NAME, dest_keys)
                 except Exception as ex:
-                    logger.warning(f"collab: failed to record existing item in friends vault for {email}: {ex}")
-            except Exception as ex:
-                logger.warning(f"send-existing failed for {k}: {ex}")
-                per_email["items"].append({"key": k, "ok": False, "error": "Internal error"})
+                    logger.warning(f"collab: failed to record existing items in friends vault for {email}: {ex}")
+
+            return per_email
 
-        results.append(per_email)
+    results: List[Dict[str, Any]] = list(await asyncio.gather(*(_deliver_one(e) for e in emails)))
+    valid = [i for i, e in enumerate(emails) if _valid_email(e)]
 
     try:
-        if emails and results:
-            sender_email = get_user_email_from_uid(uid) or "a friend"
-            gallery_link = os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip().rstrip("/") + "#gallery"
+        if valid:
+            gallery_link = _FRONT_ORIGIN + "#gallery"
             # Follow existing behavior: notify only the first recipient, but pluralize based on their item count
-            first = results[0] if isinstance(results[0], dict) else {}
+            first = results[valid[0]]
             ok_items = [it for it in (first.get("items") or []) if it.get("ok")]
             ok_count = len(ok_items)
             noun = "photo" if ok_count == 1 else "photos"
             html = render_email(
                 "email_basic.html",
                 title=("You received a photo" if ok_count == 1 else "You received photos"),
-                intro=(f"<p>You received {ok_count} {noun} from <b>{sender_email}</b> to your gallery.</p>" + (f"<p>Note: {note}</p>" if note else "")),
+                intro=(f"<p>You received {ok_count} {noun} from <b>{sender_email or 'a friend'}</b> to your gallery.</p>" + (f"<p>Note: {note}</p>" if note else "")),
                 button_url=gallery_link,
                 button_label="Open your gallery",
                 footer_note="If you weren't expecting this, you can ignore this message.",
             )
-            send_email_smtp(emails[0], ("New photo received" if ok_count == 1 else "New photos received"), html)
+            queue_email_smtp(emails[valid[0]], ("New photo received" if ok_count == 1 else "New photos received"), html)
     except Exception as ex:
         logger.warning(f"Email notify failed (send-existing): {ex}")
 
-    _record_recent(uid, emails)
+    _record_recent(uid, [emails[i] for i in valid])
 
     return {"ok": True, "results": results}
 
@@ -876,7 +985,7 @@ async def retouch_send_back(
 
     # Notify original sender
     try:
-        gallery_link = os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip().rstrip("/") + "#gallery"
+        gallery_link = _FRONT_ORIGIN + "#gallery"
         partner_email = get_user_email_from_uid(partner_uid) or "a collaborator"
         html = render_email(
             "email_basic.html",
@@ -886,7 +995,7 @@ async def retouch_send_back(
             button_label="Open your gallery",
             footer_note="You can reply back from your gallery.",
         )
-        send_email_smtp(sender_email, "Retouched photo received", html)
+        queue_email_smtp(sender_email, "Retouched photo received", html)
     except Exception as ex:
         logger.warning(f"Email notify failed (retouch send-back): {ex}")
 
@@ -311,6 +311,7 @@ def _vault_salt(uid: str, vault: str) -> str:
 
 
 import hashlib
+import hmac
 
 def _hash_password(pw: str, salt: str) -> str:
     try:
@@ -332,7 +333,9 @@ def _unlock_vault(uid: str, vault: str, password: str) -> bool:
     if not meta.get('protected'):
         return True
     salt = _vault_salt(uid, vault)
-    if meta.get('hash') == _hash_password(password or '', salt):
+    stored = meta.get('hash')
+    # Missing/malformed hashes can never match; skip hashing and compare in constant time
+    if isinstance(stored, str) and len(stored) == 64 and stored.isascii() and hmac.compare_digest(stored, _hash_password(password or '', salt)):
         s = _unlocked_vaults.get(uid)
         if not s:
             s = set()
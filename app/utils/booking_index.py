@@ -0,0 +1,28 @@
+from typing import Any, Dict, List
+
+# users/<uid>/booking/index.json maps booking id -> lite entry, oldest first, capped at
+# INDEX_LIMIT. Both app.bookings and app.routers.bookings read and write it.
+INDEX_LIMIT = 1000
+
+
+def index_items(idx: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    items = idx.get("items") or {}
+    if isinstance(items, list):
+        # Legacy shape: newest-first list of lite entries
+        items = {it["id"]: it for it in reversed(items) if it.get("id")}
+    return items
+
+
+def add_index_item(items: Dict[str, Dict[str, Any]], booking_id: str, lite: Dict[str, Any]) -> None:
+    items[booking_id] = lite
+    while len(items) > INDEX_LIMIT:
+        del items[next(iter(items))]
+
+
+def listing_key(it: Dict[str, Any]) -> tuple:
+    # Newest-first listings sort on (created_at, id) descending; the id breaks same-second ties
+    return (int(it.get("created_at") or 0), str(it.get("id") or ""))
+
+
+def newest_first(items: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(items.values(), key=listing_key, reverse=True)
@@ -1,11 +1,15 @@
 import smtplib
+import queue
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
 from email.mime.base import MIMEBase
 from email import encoders
+from functools import lru_cache
 from typing import Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
 import os
 
 from app.core.config import SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS, MAIL_FROM, logger
@@ -15,6 +19,10 @@ _templates_dir = os.path.join(os.path.dirname(__file__), "..", "templates")
 _jinja_env = Environment(
     loader=FileSystemLoader(_templates_dir),
     autoescape=select_autoescape(["html", "xml"]),
+    # Templates ship with the deploy: skip per-lookup mtime checks and keep compiled
+    # bytecode in the per-user temp cache so new workers don't re-parse them
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
 )
 
 EMAIL_BRAND_BUTTON_BG = os.getenv("EMAIL_BRAND_BUTTON_BG", "#7AA2F7")
@@ -25,16 +33,98 @@ _front = (os.getenv("FRONTEND_ORIGIN", "").split(",")[0].strip() or "").rstrip("
 EMAIL_LOGO_URL = os.getenv("EMAIL_LOGO_URL", (_front + "/marklogo.svg") if _front else "")
 
 
+# Shared render context; per-call values are layered on top
+_BASE_CONTEXT = {
+    "app_name": APP_NAME,
+    "brand_bg": EMAIL_BRAND_BG,
+    "button_bg": EMAIL_BRAND_BUTTON_BG,
+    "button_text": EMAIL_BRAND_BUTTON_TEXT,
+    "logo_url": EMAIL_LOGO_URL,
+}
+
+
+@lru_cache(maxsize=None)
+def _get_template(template_name: str):
+    # Resolve each compiled template once instead of going through the loader per email
+    return _jinja_env.get_template(template_name)
+
+
 def render_email(template_name: str, **context) -> str:
-    base = {
-        "app_name": APP_NAME,
-        "brand_bg": EMAIL_BRAND_BG,
-        "button_bg": EMAIL_BRAND_BUTTON_BG,
-        "button_text": EMAIL_BRAND_BUTTON_TEXT,
-        "logo_url": EMAIL_LOGO_URL,
-    }
-    base.update(context or {})
-    return _jinja_env.get_template(template_name).render(**base)
+    return _get_template(template_name).render({**_BASE_CONTEXT, **context})
+
+
+def _build_message(
+    to_addr: str,
+    subject: str,
+    html: str,
+    text: Optional[str] = None,
+    from_addr: Optional[str] = None,
+    reply_to: Optional[str] = None,
+    from_name: Optional[str] = None,
+    attachments: Optional[list[dict]] = None,
+):
+    sender = (from_addr or MAIL_FROM).strip()
+    display_from = f"{from_name} <{sender}>" if from_name and "<" not in sender else sender
+
+    has_attachments = bool(attachments)
+    if has_attachments:
+        outer = MIMEMultipart("mixed")
+        outer["Subject"] = subject
+        outer["From"] = display_from
+        outer["To"] = to_addr
+        if reply_to:
+            outer["Reply-To"] = reply_to
+        # Alternative part (text + html)
+        alt = MIMEMultipart("alternative")
+        if not text:
+            text = "Open this link in an HTML-capable email client."
+        alt.attach(MIMEText(text or "", "plain", _charset="utf-8"))
+        alt.attach(MIMEText(html or "", "html", _charset="utf-8"))
+        outer.attach(alt)
+        # Attach files (inline via CID if provided)
+        for att in (attachments or []):
+            try:
+                fname = str(att.get("filename") or "attachment")
+                content = att.get("content") or b""
+                mime = str(att.get("mime_type") or "application/octet-stream").lower()
+                cid = att.get("cid")
+                main, sub = mime.split("/", 1) if "/" in mime else ("application", "octet-stream")
+                if main == "image":
+                    part = MIMEImage(content, _subtype=sub)
+                    if cid:
+                        part.add_header("Content-ID", f"<{cid}>")
+                        part.add_header("Content-Disposition", f'inline; filename="{fname}"')
+                    else:
+                        part.add_header("Content-Disposition", f'attachment; filename="{fname}"')
+                else:
+                    part = MIMEBase(main, sub)
+                    part.set_payload(content)
+                    encoders.encode_base64(part)
+                    part.add_header("Content-Disposition", f'attachment; filename="{fname}"')
+                outer.attach(part)
+            except Exception:
+                continue
+        msg = outer
+    else:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = display_from
+        msg["To"] = to_addr
+        if reply_to:
+            msg["Reply-To"] = reply_to
+        if not text:
+            text = "Open this link in an HTML-capable email client."
+        msg.attach(MIMEText(text or "", "plain", _charset="utf-8"))
+        msg.attach(MIMEText(html or "", "html", _charset="utf-8"))
+    return sender, msg
+
+
+def _open_smtp() -> smtplib.SMTP:
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+    server.starttls()
+    if SMTP_USER or SMTP_PASS:
+        server.login(SMTP_USER, SMTP_PASS)
+    return server
 
 
 def send_email_smtp(
@@ -51,67 +141,159 @@ def send_email_smtp(
         if not SMTP_HOST or not SMTP_PASS or not MAIL_FROM:
             logger.error("SMTP not configured; cannot send email")
             return False
-        sender = (from_addr or MAIL_FROM).strip()
-        display_from = f"{from_name} <{sender}>" if from_name and "<" not in sender else sender
-
-        has_attachments = bool(attachments)
-        if has_attachments:
-            outer = MIMEMultipart("mixed")
-            outer["Subject"] = subject
-            outer["From"] = display_from
-            outer["To"] = to_addr
-            if reply_to:
-                outer["Reply-To"] = reply_to
-            # Alternative part (text + html)
-            alt = MIMEMultipart("alternative")
-            if not text:
-                text = "Open this link in an HTML-capable email client."
-            alt.attach(MIMEText(text or "", "plain", _charset="utf-8"))
-            alt.attach(MIMEText(html or "", "html", _charset="utf-8"))
-            outer.attach(alt)
-            # Attach files (inline via CID if provided)
-            for att in (attachments or []):
-                try:
-                    fname = str(att.get("filename") or "attachment")
-                    content = att.get("content") or b""
-                    mime = str(att.get("mime_type") or "application/octet-stream").lower()
-                    cid = att.get("cid")
-                    main, sub = mime.split("/", 1) if "/" in mime else ("application", "octet-stream")
-                    if main == "image":
-                        part = MIMEImage(content, _subtype=sub)
-                        if cid:
-                            part.add_header("Content-ID", f"<{cid}>")
-                            part.add_header("Content-Disposition", f'inline; filename="{fname}"')
-                        else:
-                            part.add_header("Content-Disposition", f'attachment; filename="{fname}"')
-                    else:
-                        part = MIMEBase(main, sub)
-                        part.set_payload(content)
-                        encoders.encode_base64(part)
-                        part.add_header("Content-Disposition", f'attachment; filename="{fname}"')
-                    outer.attach(part)
-                except Exception:
-                    continue
-            msg = outer
-        else:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = display_from
-            msg["To"] = to_addr
-            if reply_to:
-                msg["Reply-To"] = reply_to
-            if not text:
-                text = "Open this link in an HTML-capable email client."
-            msg.attach(MIMEText(text or "", "plain", _charset="utf-8"))
-            msg.attach(MIMEText(html or "", "html", _charset="utf-8"))
-
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            if SMTP_USER or SMTP_PASS:
-                server.login(SMTP_USER, SMTP_PASS)
+        sender, msg = _build_message(to_addr, subject, html, text, from_addr, reply_to, from_name, attachments)
+
+        with _open_smtp() as server:
             # Envelope sender must match the actual sending identity for some providers
             server.sendmail(sender, [to_addr], msg.as_string())
         return True
     except Exception as ex:
         logger.exception(f"SMTP send failed: {ex}")
-        return False
\ No newline at end of file
+        return False
+
+
+# ---- Queued sending: one worker thread reusing a single SMTP connection ----
+# Delivery is best-effort: mail still queued when the process exits is lost (the app
+# lifespan calls flush_mail_queue to drain it on a normal shutdown).
+_MAIL_QUEUE_MAX = int(os.getenv("MAIL_QUEUE_MAX", "1000"))
+_MAIL_IDLE_SECONDS = 30
+# Only probe the connection with NOOP after it has sat unused this long
+_MAIL_NOOP_AFTER_SECONDS = 5
+_mail_q: "queue.Queue[tuple]" = queue.Queue(maxsize=_MAIL_QUEUE_MAX)
+_mail_worker_lock = threading.Lock()
+_mail_worker: Optional[threading.Thread] = None
+
+
+def _close_quietly(server: Optional[smtplib.SMTP]):
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+class _DataPhaseError(Exception):
+    """The connection failed after DATA began; the server may already have accepted the message."""
+
+
+def _send_on(server: smtplib.SMTP, sender: str, to_addr: str, payload: str):
+    # sendmail() split at DATA so the caller can tell whether a retry could duplicate the message
+    server.ehlo_or_helo_if_needed()
+    code, resp = server.mail(sender)
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPSenderRefused(code, resp, sender)
+    code, resp = server.rcpt(to_addr)
+    if code not in (250, 251):
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused({to_addr: (code, resp)})
+    try:
+        code, resp = server.data(payload)
+    except smtplib.SMTPDataError:
+        raise
+    except Exception as ex:
+        raise _DataPhaseError(str(ex)) from ex
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPDataError(code, resp)
+
+
+def _mail_worker_loop():
+    server: Optional[smtplib.SMTP] = None
+    last_used = 0.0
+    while True:
+        try:
+            job = _mail_q.get(timeout=_MAIL_IDLE_SECONDS)
+        except queue.Empty:
+            # Providers drop idle sessions; don't hold one open between bursts
+            _close_quietly(server)
+            server = None
+            continue
+        to_addr = job[0]
+        try:
+            sender, msg = _build_message(*job)
+            payload = msg.as_string()
+            for attempt in (1, 2):
+                try:
+                    stale = time.monotonic() - last_used > _MAIL_NOOP_AFTER_SECONDS
+                    if server is None or (stale and server.noop()[0] != 250):
+                        _close_quietly(server)
+                        server = _open_smtp()
+                    _send_on(server, sender, to_addr, payload)
+                    last_used = time.monotonic()
+                    break
+                except _DataPhaseError:
+                    # Not retried: the first attempt may have been delivered
+                    _close_quietly(server)
+                    server = None
+                    raise
+                except Exception:
+                    # Failed before DATA (dead session, refused envelope): safe to retry once
+                    _close_quietly(server)
+                    server = None
+                    if attempt == 2:
+                        raise
+        except Exception as ex:
+            logger.exception(f"SMTP queued send failed for {to_addr}: {ex}")
+        finally:
+            _mail_q.task_done()
+
+
+def _ensure_mail_worker():
+    global _mail_worker
+    if _mail_worker is not None and _mail_worker.is_alive():
+        return
+    with _mail_worker_lock:
+        if _mail_worker is None or not _mail_worker.is_alive():
+            _mail_worker = threading.Thread(target=_mail_worker_loop, name="smtp-sender", daemon=True)
+            _mail_worker.start()
+
+
+def queue_email_smtp(
+    to_addr: str,
+    subject: str,
+    html: str,
+    text: Optional[str] = None,
+    from_addr: Optional[str] = None,
+    reply_to: Optional[str] = None,
+    from_name: Optional[str] = None,
+    attachments: Optional[list[dict]] = None,
+) -> bool:
+    """Enqueue an email for the background sender (best-effort; never blocks the caller).
+
+    Returns False without sending when SMTP is not configured or the queue is full.
+    """
+    if not SMTP_HOST or not SMTP_PASS or not MAIL_FROM:
+        logger.error("SMTP not configured; cannot send email")
+        return False
+    _ensure_mail_worker()
+    try:
+        _mail_q.put_nowait((to_addr, subject, html, text, from_addr, reply_to, from_name, attachments))
+        return True
+    except queue.Full:
+        # Callers run on the event loop; an inline SMTP session here would stall every request
+        logger.error(f"SMTP queue full; dropping email to {to_addr}: {subject}")
+        return False
+
+
+def flush_mail_queue(timeout: float = 10.0) -> bool:
+    """Block until queued emails have been handed to SMTP, or timeout seconds pass.
+
+    Called on shutdown so a normal restart doesn't discard pending notifications.
+    Returns False if mail was still pending when the timeout expired.
+    """
+    if _mail_worker is None or not _mail_worker.is_alive():
+        return _mail_q.unfinished_tasks == 0
+    deadline = time.monotonic() + timeout
+    with _mail_q.all_tasks_done:
+        while _mail_q.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"SMTP queue flush timed out; {_mail_q.unfinished_tasks} email(s) not sent")
+                return False
+            _mail_q.all_tasks_done.wait(remaining)
+    return True
@@ -1,19 +1,37 @@
 import os
 import json
+import asyncio
+import orjson
 from typing import Optional
 from app.core.config import s3, R2_BUCKET, R2_PUBLIC_BASE_URL, STATIC_DIR, logger
 from botocore.exceptions import ClientError
 
 
+def _dumps_json(payload: dict) -> bytes:
+    try:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # orjson is stricter about exotic types (e.g. >64-bit ints); keep the old behaviour for those
+        return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+def _loads_json(data: bytes):
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # Objects written by the old stdlib encoder may contain NaN/Infinity, which orjson rejects
+        return json.loads(data)
+
+
 def write_json_key(key: str, payload: dict):
-    data = json.dumps(payload, ensure_ascii=False)
+    data = _dumps_json(payload)
     if s3 and R2_BUCKET:
         bucket = s3.Bucket(R2_BUCKET)
-        bucket.put_object(Key=key, Body=data.encode('utf-8'), ContentType='application/json', ACL='private')
+        bucket.put_object(Key=key, Body=data, ContentType='application/json', ACL='private')
     else:
         path = os.path.join(STATIC_DIR, key)
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
+        with open(path, 'wb') as f:
             f.write(data)
 
 
@@ -22,19 +40,19 @@ def read_json_key(key: str) -> Optional[dict]:
         if s3 and R2_BUCKET:
             obj = s3.Object(R2_BUCKET, key)
             try:
-                body = obj.get()["Body"].read().decode("utf-8")
+                body = obj.get()["Body"].read()
             except ClientError as ce:
                 # Treat missing object as None without warning noise
                 if ce.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
                     return None
                 raise
-            return json.loads(body)
+            return _loads_json(body)
         else:
             path = os.path.join(STATIC_DIR, key)
             if not os.path.isfile(path):
                 return None
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(path, 'rb') as f:
+                return _loads_json(f.read())
     except Exception as ex:
         logger.warning(f"read_json_key failed for {key}: {ex}")
         return None
@@ -77,4 +95,14 @@ def read_bytes_key(key: str) -> Optional[bytes]:
                 return f.read()
     except Exception as ex:
         logger.warning(f"read_bytes_key failed for {key}: {ex}")
-        return None
\ No newline at end of file
+        return None
+
+
+async def awrite_json_key(key: str, payload: dict):
+    """Async wrapper for write_json_key; runs the blocking write in a worker thread."""
+    await asyncio.to_thread(write_json_key, key, payload)
+
+
+async def aread_json_key(key: str) -> Optional[dict]:
+    """Async wrapper for read_json_key; runs the blocking read in a worker thread."""
+    return await asyncio.to_thread(read_json_key, key)